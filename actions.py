@@ -0,0 +1,66 @@
+from enum import IntEnum
+
+
+class Action(IntEnum):
+    """A player decision, encoded as a small int. Strategies return these, and
+    each Hand keeps its history of them in a compact array (see hand.py)."""
+    HIT = 0
+    STAND = 1
+    DOUBLE = 2
+    SPLIT = 3
+
+    @property
+    def label(self) -> str:
+        """Human readable name. Only used when printing tables for people."""
+        return self.name.lower()
+
+
+class Outcome(IntEnum):
+    """How a hand finished. Set once per hand, either when it busts or when bets are resolved."""
+    BUST = 0
+    BLACKJACK = 1
+    PUSH_BLACKJACK = 2
+    WINS = 3
+    PUSH = 4
+    LOSES = 5
+
+    @property
+    def label(self) -> str:
+        return self.name.lower().replace("_", " ") # e.g., "push blackjack"
+
+
+class ChartCode(IntEnum):
+    """Cell values of the strategy charts in tables/*.csv. The first four line up with Action,
+    so a chart cell that is already a legal move can be returned as is."""
+    HIT = Action.HIT
+    STAND = Action.STAND
+    DOUBLE = Action.DOUBLE
+    SPLIT = Action.SPLIT
+    DOUBLE_ELSE_STAND = 4  # Double if possible, otherwise stand
+    NO_SPLIT = 5
+    SPLIT_IF_DAS = 6       # Split if double after split is allowed
+
+
+"""Used to convert from CSV move to chart code (so the CSV stays short and readable,
+but the game never has to compare strings)."""
+CHAR_TO_CODE = {
+    "H": ChartCode.HIT,
+    "S": ChartCode.STAND,
+    "D": ChartCode.DOUBLE,
+    "Ds": ChartCode.DOUBLE_ELSE_STAND,
+    "Y": ChartCode.SPLIT,
+    "N": ChartCode.NO_SPLIT,
+    "Yn": ChartCode.SPLIT_IF_DAS
+}
+
+
+"""Valid things for a human to type, and the Action they map to."""
+INPUT_TO_ACTION = {
+    "hit": Action.HIT,
+    "h": Action.HIT,
+    "stand": Action.STAND,
+    "s": Action.STAND,
+    "double": Action.DOUBLE,
+    "d": Action.DOUBLE,
+    "split": Action.SPLIT
+}
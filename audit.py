@@ -0,0 +1,213 @@
+"""Decision-outcome cube: realized EV by starting hand, dealer upcard and first action.
+
+Every non-natural starting hand lands in one cell of a fixed (state, upcard, action) cube, where the
+states are exactly the rows of tables/*.csv (pairs, then soft, then hard) and the action is the first
+one taken on that hand. The cell collects the hand's net units (net / initial bet, splits and
+doubles included). The cube is three flat arrays of N_STATES x 10 x N_ACTIONS cells, so an audit of
+a billion hands is still a few tens of KB, and audits of separate sessions (tournament matches,
+distributed units) add up cell by cell.
+
+A strategy only ever takes one action per cell, so to compare actions, audit a roster that plays
+the same spots differently (e.g., BasicStrategy next to RandomStrategy and DoublerStrategy).
+
+The cube is NumPy; without it, importing this module still works but DecisionAudit() raises ImportError.
+"""
+
+from __future__ import annotations
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from actions import Action, ChartCode
+from deck import CARDS_BY_CODE
+from player import CHARTS, dealer_key
+import rules
+
+
+DEALER_KEYS = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "A"] # Chart column order.
+N_UPCARDS = len(DEALER_KEYS)
+N_ACTIONS = len(Action)
+
+# One state per chart row, in CSV order. heatmap() slices these back out per chart.
+STATES = [(chart, row) for chart in ("pair", "soft", "hard") for row in CHARTS[chart]]
+STATE_INDEX = {state: i for i, state in enumerate(STATES)}
+CHART_ROWS = {chart: [i for i, (c, _) in enumerate(STATES) if c == chart] for chart in CHARTS}
+N_STATES = len(STATES)
+SIZE = N_STATES * N_UPCARDS * N_ACTIONS
+
+FLUSH_EVERY = 4096 # Buffered records per np.bincount.
+
+
+def starting_state(code1: int, code2: int) -> int:
+    """State index of a two-card starting hand (-1 for a natural, which has no decision)."""
+    k1, k2 = dealer_key(CARDS_BY_CODE[code1]), dealer_key(CARDS_BY_CODE[code2])
+    if k1 == k2:
+        return STATE_INDEX["pair", k1 + k2]
+    if "A" in (k1, k2):
+        other = k2 if k1 == "A" else k1
+        return -1 if other == "10" else STATE_INDEX["soft", "A" + other]
+    total = (10 if k1 == "10" else int(k1)) + (10 if k2 == "10" else int(k2))
+    row = "17+" if total >= 17 else "8" if total <= 8 else str(total)
+    return STATE_INDEX["hard", row]
+
+
+# Precomputed, so classifying a hand is one list lookup. Indexed by code1 * 52 + code2.
+STATE_BY_CODES = [starting_state(c1, c2) for c1 in range(52) for c2 in range(52)]
+UPCARD_BY_CODE = [DEALER_KEYS.index(dealer_key(card)) for card in CARDS_BY_CODE]
+
+# First action the charts intend for each code (NO_SPLIT means "anything but SPLIT").
+CHART_ACTION = {ChartCode.HIT: Action.HIT, ChartCode.STAND: Action.STAND, ChartCode.DOUBLE: Action.DOUBLE,
+                ChartCode.DOUBLE_ELSE_STAND: Action.DOUBLE, ChartCode.SPLIT: Action.SPLIT,
+                ChartCode.SPLIT_IF_DAS: Action.SPLIT}
+
+
+class DecisionAudit:
+    """Opt-in collector (like TrueCountStats) for the decision-outcome cube.
+
+    Round engines call starts() once the naturals are paid and record() once bets are resolved.
+    Records are buffered as flat cube indexes and folded in with np.bincount every FLUSH_EVERY
+    hands, so the per-hand cost is a couple of list appends."""
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("DecisionAudit needs NumPy (pip install numpy).")
+        self.counts = np.zeros(SIZE, dtype=np.int64)
+        self.units = np.zeros(SIZE, dtype=np.float64)    # Net units won, summed.
+        self.units_sq = np.zeros(SIZE, dtype=np.float64) # Sum of squares, for variance.
+        self.pending_index = []
+        self.pending_units = []
+
+
+    @staticmethod
+    def starts(players: list, dealer_upcard) -> list[tuple]:
+        """(player, starting hand, initial bet, base cube index) for everyone with a decision to make."""
+        upcard = UPCARD_BY_CODE[dealer_upcard.code]
+        starts = []
+        for player in players:
+            hand = player.current_hand
+            state = STATE_BY_CODES[hand.cards[0].code * 52 + hand.cards[1].code]
+            if state < 0 or not player.hands_collection: continue # Natural, already paid.
+            starts.append((player, hand, hand.bet, (state * N_UPCARDS + upcard) * N_ACTIONS))
+        return starts
+
+
+    def record(self, starts: list[tuple]) -> None:
+        """Fold in the round's results for the hands returned by starts()."""
+        multiplier = rules.PAYOUT_MULTIPLIER
+        for player, hand, initial_bet, base in starts:
+            net = 0
+            for final_hand in player.final_hands:
+                if final_hand.outcome is not None: # Split hands were replaced by the two new ones.
+                    net += final_hand.bet * (multiplier[final_hand.outcome] - 1)
+            self.pending_index.append(base + hand.actions[0])
+            self.pending_units.append(net / initial_bet)
+        if len(self.pending_index) >= FLUSH_EVERY:
+            self.flush()
+
+
+    def flush(self) -> None:
+        if not self.pending_index: return
+        index = np.array(self.pending_index, dtype=np.intp)
+        units = np.array(self.pending_units, dtype=np.float64)
+        self.counts += np.bincount(index, minlength=SIZE)
+        self.units += np.bincount(index, weights=units, minlength=SIZE)
+        self.units_sq += np.bincount(index, weights=units * units, minlength=SIZE)
+        self.pending_index.clear()
+        self.pending_units.clear()
+
+
+    def cube(self, field: str = "counts"):
+        """A field as a (state, upcard, action) array."""
+        self.flush()
+        return getattr(self, field).reshape(N_STATES, N_UPCARDS, N_ACTIONS)
+
+
+    def merge(self, other: DecisionAudit) -> DecisionAudit:
+        """Add another audit's cells into this one (its pending records get flushed first). Returns self."""
+        self.flush()
+        other.flush()
+        self.counts += other.counts
+        self.units += other.units
+        self.units_sq += other.units_sq
+        return self
+
+
+    def to_dict(self) -> dict[str, list]:
+        """The three fields as flat lists, in cube cell order (see cube()). Flushes first, so nothing buffered is lost."""
+        self.flush()
+        return {"counts": self.counts.tolist(), "units": self.units.tolist(), "units_sq": self.units_sq.tolist()}
+
+
+    @classmethod
+    def from_dict(cls, d: dict[str, list]) -> DecisionAudit:
+        """Inverse of to_dict. The lists have to come from a lab with the same charts (same N_STATES)."""
+        audit = cls()
+        audit.counts[:] = d["counts"]
+        audit.units[:] = d["units"]
+        audit.units_sq[:] = d["units_sq"]
+        return audit
+
+
+    def heatmap(self, chart: str) -> dict:
+        """Arrays shaped like tables/<chart>.csv (rows x dealer upcards), one layer per action:
+        {"rows", "columns", "actions", "counts", "ev", "std_err"}. counts/ev/std_err are
+        (rows, upcards, actions); ev and std_err are NaN where an action was never (or only once) taken."""
+        rows = CHART_ROWS[chart]
+        counts = self.cube("counts")[rows]
+        units = self.cube("units")[rows]
+        units_sq = self.cube("units_sq")[rows]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ev = np.where(counts > 0, units / counts, np.nan)
+            variance = np.where(counts > 1, (units_sq - counts * ev * ev) / (counts - 1), np.nan)
+            std_err = np.sqrt(np.maximum(variance, 0.0) / counts)
+        return {"rows": [STATES[i][1] for i in rows], "columns": DEALER_KEYS,
+                "actions": [action.label for action in Action], "counts": counts, "ev": ev, "std_err": std_err}
+
+
+    def disagreements(self, min_count: int = 1000) -> list[tuple]:
+        """Chart cells where another action did clearly better (by more than 2 standard errors) than the
+        chart's. (chart, row, upcard, chart code, better action, EV gap), biggest gap first. Only actions
+        taken at least min_count times are compared."""
+        found = []
+        for chart in CHARTS:
+            heat = self.heatmap(chart)
+            for r, row in enumerate(heat["rows"]):
+                for u, dk in enumerate(DEALER_KEYS):
+                    code = CHARTS[chart][row][dk]
+                    enough = heat["counts"][r, u] >= min_count
+                    if chart == "pair" and code == ChartCode.NO_SPLIT:
+                        chosen = [a for a in Action if a != Action.SPLIT and enough[a]]
+                        if not chosen: continue
+                        intended = max(chosen, key=lambda a: heat["ev"][r, u, a])
+                    else:
+                        intended = CHART_ACTION[code]
+                    if not enough[intended]: continue
+                    for action in Action:
+                        if action == intended or not enough[action]: continue
+                        if chart == "pair" and code == ChartCode.NO_SPLIT and action != Action.SPLIT: continue
+                        gap = heat["ev"][r, u, action] - heat["ev"][r, u, intended]
+                        noise = math.hypot(heat["std_err"][r, u, action], heat["std_err"][r, u, intended])
+                        if gap > 2 * noise:
+                            found.append((chart, row, dk, code, action, float(gap)))
+        found.sort(key=lambda d: d[5], reverse=True)
+        return found
+
+
+    def print_summary(self, min_count: int = 1000, limit: int = 20) -> None:
+        print("\n", "=" * 30, sep="")
+        print("\nDECISION AUDIT:")
+        print("\n", "=" * 30, sep="")
+        counts = self.cube("counts")
+        print(f"\n{int(counts.sum())} starting hands over {int((counts.sum(axis=2) > 0).sum())} chart cells")
+        found = self.disagreements(min_count)
+        if not found:
+            print(f"No chart cell where another action clearly did better (min {min_count} hands per action).\n")
+            return
+        print(f"\nChart | Row  | Up | Chart says        | Better | EV gap (units)")
+        print("------+------+----+-------------------+--------+---------------")
+        for chart, row, dk, code, action, gap in found[:limit]:
+            print(f"{chart:<5} | {row:<4} | {dk:<2} | {code.name:<17} | {action.label:<6} | {gap:>+.4f}")
+        print("")
@@ -0,0 +1,214 @@
+"""Persistent (SQLite) cache of sim results, keyed by configuration and seed.
+
+A configuration is fingerprinted from the roster spec, the Shoe parameters, a hash of every
+strategy table in ./tables and, for corpus shoes, the corpus file's identity, so editing a chart
+(or a deviation) or regenerating a corpus never serves stale numbers.
+Rerunning the same sim is then a lookup, and asking for more rounds than a cached run resumes
+from that run's checkpoint instead of starting over.
+
+    python cache.py            (compare every strategy across cached runs)
+
+Checkpoints are pickled Sessions. Only open cache files you made yourself.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+import random
+import sqlite3
+import time
+
+from corpus import HEADER
+from session import Session
+
+
+CACHE_VERSION = 4 # Bump when round rules/payouts (or checkpointed attributes) change, so old results stop matching.
+TABLES_GLOB = "./tables/*.csv"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    n_rounds INTEGER NOT NULL,
+    config TEXT NOT NULL,
+    results TEXT NOT NULL,
+    checkpoint BLOB,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    UNIQUE (fingerprint, seed, n_rounds)
+);
+CREATE INDEX IF NOT EXISTS runs_last_used ON runs (last_used);
+
+CREATE TABLE IF NOT EXISTS run_players (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    seat INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    bankroll INTEGER NOT NULL,
+    initial_bankroll INTEGER NOT NULL,
+    max_bankroll INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS run_players_strategy ON run_players (strategy, run_id);
+CREATE INDEX IF NOT EXISTS run_players_run ON run_players (run_id);
+"""
+
+
+def tables_hash(pattern: str = TABLES_GLOB) -> str:
+    """Hash of every strategy table's name and contents."""
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(pattern)):
+        digest.update(path.encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def corpus_hash(path: str) -> str:
+    """Hash of a corpus file's header, size and modification time. Regenerating the corpus in place
+    changes at least the mtime, so results dealt from the old file stop matching."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        digest.update(f.read(HEADER.size))
+        stat = os.fstat(f.fileno())
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def fingerprint(roster: list[list], shoe: dict) -> str:
+    config = {"version": CACHE_VERSION, "roster": roster, "shoe": shoe, "tables": tables_hash()}
+    if shoe.get("corpus_path"):
+        config["corpus"] = corpus_hash(shoe["corpus_path"]) # The path alone says nothing about what's in it.
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    """SQLite-backed store of finished sims. run() is the main entry point. Least recently used
+    runs are evicted once there are more than max_entries."""
+
+    def __init__(self, path: str = "results.sqlite", max_entries: int = 1000):
+        self.path = path
+        self.max_entries = max_entries
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(SCHEMA)
+
+
+    def close(self) -> None:
+        self.db.close()
+
+
+    def run(self, roster: list[list], shoe: dict, seed: int, n_rounds: int, tc_stats: bool = False) -> dict:
+        """Results of Session.from_config(roster, shoe, seed, n_rounds) (see results() for the shape).
+        Served from the cache when possible, extended from the longest cached prefix otherwise."""
+        fp = fingerprint(roster, shoe)
+        row = self.db.execute(
+            "SELECT id, results FROM runs WHERE fingerprint = ? AND seed = ? AND n_rounds = ?",
+            (fp, seed, n_rounds)).fetchone()
+        if row is not None:
+            results = json.loads(row[1])
+            if not tc_stats or results["tc_stats"] is not None:
+                self.touch(row[0])
+                return results
+
+        session = self.longest_prefix(fp, seed, n_rounds, tc_stats)
+        if session is None:
+            session = Session.from_config(roster, shoe, seed, n_rounds, tc_stats)
+        session.n_rounds = n_rounds
+        session.play_session(print_results=False)
+
+        results = self.results(session)
+        self.store(fp, seed, n_rounds, {"roster": roster, "shoe": shoe, "tc_stats": tc_stats}, results, session)
+        return results
+
+
+    def longest_prefix(self, fp: str, seed: int, n_rounds: int, tc_stats: bool) -> Session | None:
+        """Checkpointed session of the longest cached run with fewer rounds, if there is one."""
+        rows = self.db.execute(
+            "SELECT id, checkpoint FROM runs WHERE fingerprint = ? AND seed = ? AND n_rounds < ? "
+            "AND checkpoint IS NOT NULL ORDER BY n_rounds DESC", (fp, seed, n_rounds))
+        for run_id, checkpoint in rows:
+            session, random_state = pickle.loads(checkpoint)
+            if tc_stats and session.tc_stats is None: continue # Prefix didn't collect stats, can't extend it.
+            random.setstate(random_state) # Seeded along with the table (see seeded_table), so it's part of the checkpoint.
+            self.touch(run_id)
+            return session
+        return None
+
+
+    @staticmethod
+    def results(session: Session) -> dict:
+        return {"rounds_played": session.round_number - 1,
+                "players": session.bankroll_results(),
+                "tc_stats": session.tc_stats.to_dict() if session.tc_stats is not None else None}
+
+
+    def store(self, fp: str, seed: int, n_rounds: int, config: dict, results: dict, session: Session) -> None:
+        # Corpus shoes are backed by a memory map, which can't be pickled. Their results are still cached.
+        checkpoint = pickle.dumps((session, random.getstate())) if session.shoe.corpus is None else None
+        now = time.time()
+        with self.db:
+            self.db.execute("DELETE FROM runs WHERE fingerprint = ? AND seed = ? AND n_rounds = ?", (fp, seed, n_rounds))
+            run_id = self.db.execute(
+                "INSERT INTO runs (fingerprint, seed, n_rounds, config, results, checkpoint, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (fp, seed, n_rounds, json.dumps(config), json.dumps(results), checkpoint, now, now)).lastrowid
+            self.db.executemany(
+                "INSERT INTO run_players VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, seat, p["name"], config["roster"][seat][2], p["bankroll"], p["initial_bankroll"], p["max_bankroll"])
+                 for seat, p in enumerate(results["players"])])
+        self.evict()
+
+
+    def touch(self, run_id: int) -> None:
+        with self.db:
+            self.db.execute("UPDATE runs SET last_used = ? WHERE id = ?", (time.time(), run_id))
+
+
+    def evict(self, max_entries: int = None) -> int:
+        """Delete least recently used runs beyond max_entries. Returns how many were deleted."""
+        keep = self.max_entries if max_entries is None else max_entries
+        with self.db:
+            deleted = self.db.execute(
+                "DELETE FROM runs WHERE id NOT IN (SELECT id FROM runs ORDER BY last_used DESC LIMIT ?)",
+                (keep,)).rowcount
+        return deleted
+
+
+    def compare(self, n_rounds: int = None) -> list[tuple]:
+        """(strategy, runs, average net growth %, average max growth %, ruined) per strategy,
+        over every cached run (or only runs of n_rounds rounds)."""
+        query = """
+            SELECT p.strategy, COUNT(*),
+                   AVG(100.0 * (p.bankroll - p.initial_bankroll) / p.initial_bankroll),
+                   AVG(100.0 * (p.max_bankroll - p.initial_bankroll) / p.initial_bankroll),
+                   SUM(p.bankroll <= 0)
+            FROM run_players p JOIN runs r ON r.id = p.run_id
+            {where}
+            GROUP BY p.strategy ORDER BY 3 DESC"""
+        if n_rounds is None:
+            return self.db.execute(query.format(where="")).fetchall()
+        return self.db.execute(query.format(where="WHERE r.n_rounds = ?"), (n_rounds,)).fetchall()
+
+
+    def history(self, roster: list[list] = None, shoe: dict = None, limit: int = 50) -> list[tuple]:
+        """(seed, n_rounds, created, results) of recent runs, optionally only for one configuration."""
+        if roster is None:
+            rows = self.db.execute(
+                "SELECT seed, n_rounds, created, results FROM runs ORDER BY created DESC LIMIT ?", (limit,))
+        else:
+            rows = self.db.execute(
+                "SELECT seed, n_rounds, created, results FROM runs WHERE fingerprint = ? ORDER BY created DESC LIMIT ?",
+                (fingerprint(roster, shoe), limit))
+        return [(seed, n, created, json.loads(results)) for seed, n, created, results in rows]
+
+
+if __name__ == "__main__":
+    cache = ResultCache()
+    print("\nStrategy                   | Runs  | Avg net growth | Avg max growth | Ruined")
+    print("---------------------------+-------+----------------+----------------+-------")
+    for strategy, runs, net, max_growth, ruined in cache.compare():
+        print(f"{strategy:<26} | {runs:>5} | {net:>13.2f}% | {max_growth:>13.2f}% | {ruined:>6}")
+    cache.close()
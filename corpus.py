@@ -0,0 +1,106 @@
+"""Pre-generated shoe orders, stored one byte per card (see Card.code) in a memory-mapped file.
+
+Dealing from a corpus makes reruns fully reproducible, lets different strategies be replayed against
+exactly the same cards, and turns a reshuffle into a pointer move (no shuffling, no Card objects built).
+
+    python corpus.py shoes.bin --shoes 1000000 --decks 6 --seed 0
+
+File layout: a 16 byte header (magic, deck count, number of shoes), then each shoe's card codes back to back.
+"""
+
+import argparse
+import mmap
+import random
+import struct
+
+from deck import CARDS_BY_CODE
+
+
+MAGIC = b"BJSHOE1\n"
+HEADER = struct.Struct("<8sHxxI") # magic, deck count, (padding), number of shoes
+
+
+def generate_corpus(path: str, n_shoes: int, deck_count: int = 6, seed: int = None, chunk: int = 10000) -> None:
+    """Write n_shoes shuffled shoe orders to path. Same seed, same file."""
+    rng = random.Random(seed)
+    order = bytearray(range(52)) * deck_count
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, deck_count, n_shoes))
+        buffer = bytearray()
+        for i in range(n_shoes):
+            rng.shuffle(order)
+            buffer += order
+            if (i + 1) % chunk == 0:
+                f.write(buffer)
+                buffer.clear()
+        f.write(buffer)
+
+
+class CorpusOrder:
+    """One shoe, dealt straight out of the corpus. Acts enough like the Shoe.cards list
+    (len, pop from the end, iteration) that Shoe doesn't need to care where its cards came from."""
+    __slots__ = ("view", "remaining")
+
+    def __init__(self, view: memoryview):
+        self.view = view
+        self.remaining = len(view)
+
+    def __len__(self) -> int:
+        return self.remaining
+
+    def pop(self):
+        self.remaining -= 1
+        return CARDS_BY_CODE[self.view[self.remaining]]
+
+    def take(self, n: int) -> list:
+        """Pop n cards at once."""
+        self.remaining -= n
+        return [CARDS_BY_CODE[code] for code in self.view[self.remaining:self.remaining + n]]
+
+    def __iter__(self):
+        """Cards still in the shoe."""
+        return (CARDS_BY_CODE[code] for code in self.view[:self.remaining])
+
+
+class ShoeCorpus:
+    """Read-only view of a corpus file. next_order() hands out shoes start, start + step, start + 2*step, ...
+    and wraps around at the end of the file. (A step lets several shoes share one corpus without overlapping,
+    e.g., table i of n uses start=i, step=n.)"""
+
+    def __init__(self, path: str, start: int = 0, step: int = 1):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.deck_count, self.n_shoes = HEADER.unpack_from(self.mmap)
+        if magic != MAGIC:
+            raise ValueError(f"{path} isn't a shoe corpus.")
+        self.shoe_size = 52 * self.deck_count
+        if len(self.mmap) != HEADER.size + self.n_shoes * self.shoe_size:
+            raise ValueError(f"{path} is truncated (or has extra bytes).")
+        self.view = memoryview(self.mmap)[HEADER.size:]
+        self.position = start % self.n_shoes
+        self.step = step
+
+    def __len__(self) -> int:
+        return self.n_shoes
+
+    def order(self, i: int) -> memoryview:
+        """Card codes of shoe i. Cards are dealt from the end."""
+        return self.view[i * self.shoe_size:(i + 1) * self.shoe_size]
+
+    def next_order(self) -> CorpusOrder:
+        order = CorpusOrder(self.order(self.position))
+        self.position = (self.position + self.step) % self.n_shoes
+        return order
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate shuffled shoe orders.")
+    parser.add_argument("path")
+    parser.add_argument("--shoes", type=int, default=1000000)
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    generate_corpus(args.path, args.shoes, args.decks, args.seed)
+    print(f"Wrote {args.shoes} shoes ({args.decks} decks each) to {args.path}")
@@ -19,3 +19,9 @@ class CardCounter:
         self.true_count = math.floor(self.running_count / self.decks_remaining)
 
         # print(f"DEBUG: rc: {self.running_count}, tc: {self.true_count}")
+
+    def update_counts_bulk(self, hilo_total: int, n: float) -> None:
+        """Same as calling update_counts for many cards, given the sum of their Hi-Lo values."""
+        self.decks_remaining = n
+        self.running_count += hilo_total
+        self.true_count = math.floor(self.running_count / self.decks_remaining)
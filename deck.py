@@ -3,6 +3,7 @@ class Card:
     def __init__(self, rank: str, suit: str):
         self.rank = rank  # e.g., "2", "J", "A"
         self.suit = suit  # e.g., "Hearts", "Spades"
+        self.code = SUIT_INDEX[suit] * 13 + RANK_INDEX[rank] # 0-51, same order as a fresh Deck. Fits in one byte.
 
     def __str__(self):
         return f"{self.rank}{self.suit}"
@@ -42,5 +43,9 @@ class Deck:
         self.cards = [Card(rank, suit) for suit in self.suits for rank in self.ranks]
 
 
+RANK_INDEX = {rank: i for i, rank in enumerate(Deck.ranks)}
+SUIT_INDEX = {suit: i for i, suit in enumerate(Deck.suits)}
 
-
+# One Card per code, for turning packed codes (e.g., from a shoe corpus) back into cards.
+CARDS_BY_CODE = Deck().cards
+HILO_BY_CODE = [card.hilo_value for card in CARDS_BY_CODE]
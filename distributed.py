@@ -0,0 +1,349 @@
+"""Coordinator/worker mode, for spreading big sims (100M+ rounds) over several machines.
+
+The coordinator splits a session config (roster spec, shoe parameters, seed space) into work units.
+Each unit is an independent, seeded session of `rounds_per_unit` rounds with fresh bankrolls.
+Workers connect over TCP, pull units one at a time, and send back results, which the coordinator
+merges. If a worker drops its connection, goes quiet (no heartbeat for `heartbeat_timeout` seconds) or
+reports an error, its unit is handed to the next worker that asks, up to `max_attempts` tries. A unit
+that runs out of tries, or being left with no workers, fails the run instead of waiting forever.
+Workers that lose the coordinator reconnect.
+
+Messages are newline delimited JSON. There is no authentication, so only run this on machines/networks
+you trust.
+
+    python distributed.py coordinator --units 100 --rounds 1000000 --port 5555
+    python distributed.py worker --host 10.0.0.2 --port 5555        (on each machine, as many as you like)
+    python distributed.py local --workers 4 --units 16 --rounds 10000   (everything on this box)
+"""
+
+import argparse
+import json
+import multiprocessing
+import socket
+import socketserver
+import threading
+import time
+
+from rules import DEFAULT_SHOE
+from session import Session
+from stats import TrueCountStats
+
+
+DEFAULT_ROSTER = [["CardCountingPlayer", "The Pro", "IndexStrategy", 100000]]
+HEARTBEAT_INTERVAL = 5.0 # Seconds between heartbeats while a side is busy.
+HEARTBEAT_TIMEOUT = 30.0 # Seconds of silence before the other side counts as dead.
+MAX_ATTEMPTS = 3         # Times a unit is handed out before the run fails.
+WORKER_WAIT = 60.0       # Seconds the coordinator waits with no workers connected before giving up.
+
+
+def make_units(roster: list[list], shoe: dict, n_units: int, rounds_per_unit: int,
+               seed: int = 0, tc_stats: bool = False) -> list[dict]:
+    """Split a session config into work units. Unit i uses seed `seed + i`, so the whole run is reproducible."""
+    return [{"id": i, "roster": roster, "shoe": shoe, "seed": seed + i,
+             "n_rounds": rounds_per_unit, "tc_stats": tc_stats} for i in range(n_units)]
+
+
+def run_unit(unit: dict) -> dict:
+    """Play one work unit and return its (JSON friendly) result."""
+    session = Session.from_config(unit["roster"], unit["shoe"], unit["seed"], unit["n_rounds"], unit["tc_stats"])
+    session.play_session(print_results=False)
+    return {"id": unit["id"],
+            "players": session.bankroll_results(),
+            "tc_stats": session.tc_stats.to_dict() if session.tc_stats is not None else None}
+
+
+def merge_results(results: list[dict]) -> dict:
+    """Combine unit results into per-player totals (and one TrueCountStats, if collected)."""
+    players = {}
+    tc_stats = None
+    for result in sorted(results, key=lambda r: r["id"]):
+        for p in result["players"]:
+            totals = players.setdefault(p["name"], {"units": 0, "ruined": 0, "net": 0, "max_growth": 0.0})
+            totals["units"] += 1
+            totals["ruined"] += p["bankroll"] <= 0
+            totals["net"] += p["bankroll"] - p["initial_bankroll"]
+            growth = (p["max_bankroll"] - p["initial_bankroll"]) / p["initial_bankroll"]
+            totals["max_growth"] = max(totals["max_growth"], growth)
+        if result["tc_stats"] is not None:
+            unit_stats = TrueCountStats.from_dict(result["tc_stats"])
+            tc_stats = unit_stats if tc_stats is None else tc_stats.merge(unit_stats)
+    return {"players": players, "tc_stats": tc_stats}
+
+
+def print_merged_results(merged: dict) -> None:
+    print("\n", "=" * 30, sep="")
+    print("\nDISTRIBUTED RESULTS:")
+    print("\n", "=" * 30, sep="")
+    for name, totals in merged["players"].items():
+        print(f"\n{name}: {totals['units']} sessions, {totals['ruined']} ruined")
+        print(f"Total net: ${totals['net']} (${totals['net'] / totals['units']:.2f} per session)")
+        print(f"Best max bankroll growth: {100 * totals['max_growth']:.2f}%")
+    print("")
+    if merged["tc_stats"] is not None:
+        merged["tc_stats"].print_summary()
+
+
+def send(sock_file, message: dict) -> None:
+    sock_file.write((json.dumps(message) + "\n").encode())
+    sock_file.flush()
+
+
+def receive(sock_file) -> dict | None:
+    """Next message that isn't a heartbeat, or None if the other side hung up.
+    Raises socket.timeout (an OSError) if the other side goes quiet for longer than the socket timeout."""
+    while True:
+        line = sock_file.readline()
+        if not line: return None
+        message = json.loads(line)
+        if message["type"] != "heartbeat": return message
+
+
+class ReusableTCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True # So a restarted coordinator can have its port straight back.
+    daemon_threads = True
+
+
+class Coordinator:
+    """Hands out work units over TCP and collects the results. Call run() to serve until every unit is done.
+
+    Both sides send a heartbeat every HEARTBEAT_INTERVAL seconds while they're busy (the worker while it
+    plays a unit, the coordinator while it has nothing to hand out), so a connection that goes quiet for
+    heartbeat_timeout seconds is dead, however long a unit takes. A unit whose worker dies, hangs up or
+    reports an error goes back in the queue, up to max_attempts tries in total."""
+
+    def __init__(self, units: list[dict], host: str = "127.0.0.1", port: int = 0,
+                 heartbeat_timeout: float = HEARTBEAT_TIMEOUT, max_attempts: int = MAX_ATTEMPTS,
+                 worker_wait: float = WORKER_WAIT):
+        if heartbeat_timeout <= 2 * HEARTBEAT_INTERVAL:
+            raise ValueError(f"heartbeat_timeout has to be well over the {HEARTBEAT_INTERVAL}s heartbeat interval.")
+        self.pending = list(reversed(units)) # Popped from the end, so units go out in id order.
+        self.n_units = len(units)
+        self.results = {}
+        self.attempts = {} # Unit id -> times handed out.
+        self.failed = {}   # Unit id -> last error, for units that used up their attempts.
+        self.reissued = 0
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.worker_wait = worker_wait
+        self.workers = 0 # Currently connected.
+        self.idle_since = time.time() # When the last worker left (or the coordinator started).
+        self.lock = threading.Condition()
+
+        coordinator = self
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                coordinator.serve_worker(self.connection, self.rfile, self.wfile)
+
+        self.server = ReusableTCPServer((host, port), Handler)
+        self.address = self.server.server_address # Actual port, if port=0 was passed.
+
+
+    def done(self) -> bool:
+        return len(self.results) == self.n_units
+
+
+    def finished(self) -> bool:
+        """Done, or given up on (one failed unit fails the run, so there's no point handing out more)."""
+        return self.done() or bool(self.failed)
+
+
+    def next_unit(self, timeout: float) -> dict | None:
+        """Wait up to timeout seconds for a unit to hand out. None if there's nothing (yet, or ever: check finished())."""
+        with self.lock:
+            if not self.pending and not self.finished():
+                self.lock.wait(timeout=timeout)
+            if not self.pending or self.finished(): return None
+            unit = self.pending.pop()
+            self.attempts[unit["id"]] = self.attempts.get(unit["id"], 0) + 1
+            return unit
+
+
+    def add_result(self, result: dict) -> None:
+        with self.lock:
+            self.results.setdefault(result["id"], result) # Ignore late duplicates.
+            self.lock.notify_all()
+
+
+    def unit_lost(self, unit: dict, error: str) -> None:
+        """Put unit back in the queue, or fail it if that was its last attempt."""
+        with self.lock:
+            if unit["id"] not in self.results:
+                if self.attempts[unit["id"]] >= self.max_attempts:
+                    self.failed[unit["id"]] = error
+                else:
+                    self.pending.append(unit)
+                    self.reissued += 1
+            self.lock.notify_all()
+
+
+    def serve_worker(self, connection, rfile, wfile) -> None:
+        connection.settimeout(self.heartbeat_timeout)
+        with self.lock:
+            self.workers += 1
+        unit = None
+        error = "worker hung up"
+        try:
+            while True:
+                message = receive(rfile)
+                if message is None: break
+                if message["type"] == "result":
+                    # Might be for a unit from before the worker reconnected; it counts all the same.
+                    self.add_result(message["result"])
+                    if unit is not None and message["result"]["id"] == unit["id"]: unit = None
+                elif message["type"] == "error":
+                    if unit is not None and message["id"] == unit["id"]:
+                        self.unit_lost(unit, message["error"])
+                        unit = None
+                elif message["type"] == "ready":
+                    unit = self.next_unit(HEARTBEAT_INTERVAL)
+                    while unit is None and not self.finished():
+                        send(wfile, {"type": "heartbeat"}) # Nothing to hand out yet, but still here.
+                        unit = self.next_unit(HEARTBEAT_INTERVAL)
+                    if unit is None:
+                        send(wfile, {"type": "done"})
+                        break
+                    send(wfile, {"type": "work", "unit": unit})
+        except (OSError, ValueError, KeyError) as e:
+            error = f"{type(e).__name__}: {e}" # Dead, silent or misbehaving worker.
+        finally:
+            if unit is not None:
+                self.unit_lost(unit, error)
+            with self.lock:
+                self.workers -= 1
+                if not self.workers: self.idle_since = time.time()
+                self.lock.notify_all()
+
+
+    def run(self, alive=None) -> list[dict]:
+        """Serve workers until every unit has a result. Returns the results, in unit order.
+
+        Raises RuntimeError if a unit fails max_attempts times, if no worker is connected for worker_wait
+        seconds while units are unfinished, or if alive (optional, called about once a second) returns False."""
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with self.lock:
+                self.idle_since = time.time()
+                while not self.finished():
+                    unfinished = self.n_units - len(self.results)
+                    if not self.workers and time.time() - self.idle_since > self.worker_wait:
+                        raise RuntimeError(f"No workers connected for {self.worker_wait:.0f}s, {unfinished} units unfinished.")
+                    if alive is not None and not alive():
+                        raise RuntimeError(f"Every worker is gone, {unfinished} units unfinished.")
+                    self.lock.wait(timeout=1.0)
+        finally:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.failed:
+            unit_id, error = min(self.failed.items())
+            raise RuntimeError(f"{len(self.failed)} units failed {self.max_attempts} times (unit {unit_id}: {error}).")
+        return [self.results[i] for i in sorted(self.results)]
+
+
+def connect(host: str, port: int, timeout: float) -> socket.socket:
+    """Connect, retrying for up to timeout seconds (the coordinator might not be up yet, or be restarting)."""
+    deadline = time.time() + timeout
+    while True:
+        try:
+            return socket.create_connection((host, port))
+        except OSError:
+            if time.time() > deadline: raise
+            time.sleep(0.2)
+
+
+def work(sock_file, unit: dict) -> dict:
+    """Play unit, heartbeating the coordinator from another thread meanwhile. Returns the message to send back."""
+    stop = threading.Event()
+    def heartbeat():
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                send(sock_file, {"type": "heartbeat"})
+            except OSError:
+                return # Connection's gone; the main thread finds out when it sends the result.
+    thread = threading.Thread(target=heartbeat, daemon=True)
+    thread.start()
+    try:
+        return {"type": "result", "result": run_unit(unit)}
+    except Exception as e:
+        return {"type": "error", "id": unit["id"], "error": f"{type(e).__name__}: {e}"}
+    finally:
+        stop.set()
+        thread.join() # Only one thread writes to the socket at a time.
+
+
+def run_worker(host: str, port: int, connect_timeout: float = 30.0, heartbeat_timeout: float = HEARTBEAT_TIMEOUT) -> int:
+    """Pull and run units until the coordinator says it's done. Returns units completed.
+
+    If the connection drops, reconnects and sends back the result it was holding, if any. Gives up once
+    the coordinator can't be reached for connect_timeout seconds."""
+    completed = 0
+    unsent = None
+    connected_before = False
+    while True:
+        try:
+            sock = connect(host, port, connect_timeout)
+        except OSError:
+            if not connected_before: raise
+            return completed # Coordinator's gone for good.
+        connected_before = True
+        sock.settimeout(heartbeat_timeout)
+        try:
+            with sock, sock.makefile("rwb") as sock_file: # Closing flushes, which can fail too, so it's inside the try.
+                if unsent is not None:
+                    send(sock_file, unsent)
+                while True:
+                    send(sock_file, {"type": "ready"})
+                    message = receive(sock_file)
+                    if message is None: break # Hung up on us; try again.
+                    if unsent is not None:
+                        # Writes to a dead connection can still "succeed", so a result only counts as
+                        # delivered once the coordinator answers the message after it.
+                        completed += unsent["type"] == "result"
+                        unsent = None
+                    if message["type"] == "done": return completed
+                    unsent = work(sock_file, message["unit"])
+                    send(sock_file, unsent)
+        except OSError:
+            pass # Dropped or went quiet. Reconnect.
+
+
+def run_local(units: list[dict], n_workers: int = 2, heartbeat_timeout: float = HEARTBEAT_TIMEOUT,
+              max_attempts: int = MAX_ATTEMPTS) -> list[dict]:
+    """Coordinator plus n_workers worker processes, all on localhost. Fails fast if every worker process dies."""
+    coordinator = Coordinator(units, "127.0.0.1", 0, heartbeat_timeout, max_attempts)
+    host, port = coordinator.address
+    workers = [multiprocessing.Process(target=run_worker, args=(host, port, 30.0, heartbeat_timeout), daemon=True)
+               for _ in range(n_workers)]
+    for worker in workers: worker.start()
+    try:
+        results = coordinator.run(alive=lambda: any(worker.is_alive() for worker in workers))
+    finally:
+        for worker in workers: worker.join(timeout=5)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distributed Blackjack Lab simulations.")
+    parser.add_argument("mode", choices=["coordinator", "worker", "local"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5555)
+    parser.add_argument("--units", type=int, default=16, help="Number of independent sessions.")
+    parser.add_argument("--rounds", type=int, default=10000, help="Rounds per session.")
+    parser.add_argument("--seed", type=int, default=0, help="Unit i uses seed + i.")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(), help="Local mode only.")
+    parser.add_argument("--heartbeat-timeout", type=float, default=HEARTBEAT_TIMEOUT, help="Seconds before a silent worker's unit is re-issued.")
+    parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS, help="Tries per unit before the run fails.")
+    parser.add_argument("--tc-stats", action="store_true", help="Also collect per true count stats.")
+    args = parser.parse_args()
+
+    if args.mode == "worker":
+        print(f"Worker finished {run_worker(args.host, args.port, heartbeat_timeout=args.heartbeat_timeout)} units.")
+    else:
+        units = make_units(DEFAULT_ROSTER, DEFAULT_SHOE, args.units, args.rounds, args.seed, args.tc_stats)
+        if args.mode == "local":
+            results = run_local(units, args.workers, args.heartbeat_timeout, args.max_attempts)
+        else:
+            coordinator = Coordinator(units, args.host, args.port, args.heartbeat_timeout, args.max_attempts)
+            print(f"Coordinator listening on {coordinator.address[0]}:{coordinator.address[1]}")
+            results = coordinator.run()
+        print_merged_results(merge_results(results))
@@ -0,0 +1,200 @@
+"""Golden traces: proof that a faster engine still plays exactly like Round.
+
+A trace is recorded from the reference engine (Round) for a seeded shoe and a fixed roster. For every
+round it keeps every card dealt (by Card.code), every hand's decisions (Hand.actions), every
+settlement (outcome and final bet), each seat's bankroll, and the true count at bet time. Replaying
+runs another engine from the same seed and compares round by round, stopping at the first divergence.
+
+    python golden.py record golden.jsonl --seed 0 --rounds 5000
+    python golden.py replay golden.jsonl --engine sim_round:SimRound
+    python golden.py bench --rounds 20000 --engine sim_round:SimRound
+    python golden.py bench --rounds 2000 --engine table_state:TableRound --reference sim_round:SimRound --seats 200
+
+An engine is anything with Round's constructor and play_round(). It has to deal through
+shoe.deal_card (or shoe.deal_cards) for its cards to be traced.
+
+Traces are JSON lines (gzipped if the path ends in .gz): a header with the config, then one line per round.
+"""
+
+import argparse
+import contextlib
+import gzip
+import importlib
+import io
+import json
+import time
+
+from round import Round
+from rules import DEFAULT_SHOE
+from session import seeded_table
+from shoe import Shoe
+
+
+# A bit of everything: fixed and random decisions, doubles, splits, batchable and not, counting.
+DEFAULT_ROSTER = [
+    ["Player", "Rational", "RationalStrategy", 100000],
+    ["Player", "Doubler", "DoublerStrategy", 100000],
+    ["Player", "Random", "RandomStrategy", 100000],
+    ["CardCountingPlayer", "Basic", "BasicStrategy", 100000],
+    ["CardCountingPlayer", "Index", "IndexStrategy", 100000]]
+FIELDS = ("true_count", "cards", "decisions", "settlements", "bankrolls") # Compared in this order.
+
+
+class TracingShoe(Shoe):
+    """Shoe that remembers the code of every card it deals (until the trace is taken)."""
+
+    def __init__(self, *args, **kwargs):
+        self.dealt = []
+        super().__init__(*args, **kwargs)
+
+    def deal_card(self, update_count: bool = True):
+        card = super().deal_card(update_count)
+        self.dealt.append(card.code)
+        return card
+
+    def deal_cards(self, n: int):
+        cards = super().deal_cards(n)
+        self.dealt += [card.code for card in cards]
+        return cards
+
+    def take_dealt(self) -> list[int]:
+        dealt, self.dealt = self.dealt, []
+        return dealt
+
+
+def load_engine(name: str):
+    """"module:Class" (e.g., "sim_round:SimRound") to the class."""
+    module, _, attr = name.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def trace_rounds(engine, roster: list[list], shoe: dict, seed: int, n_rounds: int):
+    """Play n_rounds with engine, yielding one trace record per round. Engine output is swallowed."""
+    seats, tracing_shoe = seeded_table(roster, shoe, seed, TracingShoe)
+    players = list(seats) # Engines remove broke players from this list, seats keeps everyone.
+    for round_number in range(1, n_rounds + 1):
+        if not players: return
+        true_count = tracing_shoe.card_counter.true_count
+        in_round = [player.bankroll > 0 for player in seats] # Removed at the start of this round otherwise.
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine(players, tracing_shoe, round_number, False).play_round()
+
+        decisions, settlements = [], []
+        for player, played in zip(seats, in_round):
+            # Naturals never make it to final_hands, so fall back on the hand that was dealt.
+            hands = (player.final_hands or [player.current_hand]) if played else []
+            decisions.append([list(hand.actions) for hand in hands])
+            settlements.append([[None if hand.outcome is None else int(hand.outcome), hand.bet] for hand in hands])
+        yield {"round": round_number, "true_count": true_count, "cards": tracing_shoe.take_dealt(),
+               "decisions": decisions, "settlements": settlements,
+               "bankrolls": [player.bankroll for player in seats]}
+
+
+def open_trace(path: str, mode: str):
+    return gzip.open(path, mode + "t") if path.endswith(".gz") else open(path, mode)
+
+
+def record(path: str, n_rounds: int, seed: int = 0, roster: list[list] = None, shoe: dict = None) -> int:
+    """Record a golden trace from Round. Returns the number of rounds written."""
+    roster = DEFAULT_ROSTER if roster is None else roster
+    shoe = DEFAULT_SHOE if shoe is None else shoe
+    written = 0
+    with open_trace(path, "w") as f:
+        f.write(json.dumps({"roster": roster, "shoe": shoe, "seed": seed, "n_rounds": n_rounds}) + "\n")
+        for written, round_trace in enumerate(trace_rounds(Round, roster, shoe, seed, n_rounds), 1):
+            f.write(json.dumps(round_trace) + "\n")
+    return written
+
+
+def first_difference(expected: list, actual: list) -> int:
+    for i, (a, b) in enumerate(zip(expected, actual)):
+        if a != b: return i
+    return min(len(expected), len(actual))
+
+
+def replay(path: str, engine) -> dict | None:
+    """Replay a golden trace against engine. Returns None if they match, otherwise the first
+    divergence: {"round", "field", "index", "expected", "actual"} (index is the first differing
+    element of that field, e.g., which card)."""
+    with open_trace(path, "r") as f:
+        config = json.loads(f.readline())
+        actual_rounds = trace_rounds(engine, config["roster"], config["shoe"], config["seed"], config["n_rounds"])
+        for line in f:
+            expected = json.loads(line)
+            actual = next(actual_rounds, None)
+            if actual is None:
+                return {"round": expected["round"], "field": "round", "index": 0, "expected": expected, "actual": None}
+            for field in FIELDS:
+                if expected[field] != actual[field]:
+                    index = first_difference(expected[field], actual[field]) if isinstance(expected[field], list) else 0
+                    return {"round": expected["round"], "field": field, "index": index,
+                            "expected": expected[field], "actual": actual[field]}
+        extra = next(actual_rounds, None)
+        if extra is not None:
+            return {"round": extra["round"], "field": "round", "index": 0, "expected": None, "actual": extra}
+    return None
+
+
+def print_divergence(divergence: dict | None, engine_name: str) -> None:
+    if divergence is None:
+        print(f"{engine_name} matches the golden trace.")
+        return
+    print(f"{engine_name} diverges in round {divergence['round']}, field '{divergence['field']}' "
+          f"(first difference at index {divergence['index']}):")
+    print(f"  expected: {divergence['expected']}")
+    print(f"  actual:   {divergence['actual']}")
+
+
+def time_engine(engine, n_rounds: int, seed: int = 0, roster: list[list] = None, shoe: dict = None) -> float:
+    """Seconds to play n_rounds with engine, with an ordinary (untraced) Shoe."""
+    players, plain_shoe = seeded_table(DEFAULT_ROSTER if roster is None else roster, DEFAULT_SHOE if shoe is None else shoe, seed)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()): # Round prints every round; this at least keeps it off the terminal.
+        for round_number in range(1, n_rounds + 1):
+            if not players: break
+            engine(players, plain_shoe, round_number, False).play_round()
+    return time.perf_counter() - start
+
+
+# Seats whose bets don't grow with their bankroll, so with bench bankrolls nobody goes broke and the table
+# stays the same size for the whole run (DEFAULT_ROSTER's other strategies bet a share of their bankroll).
+BENCH_SEATS = [
+    ["CardCountingPlayer", "Basic", "BasicStrategy"],
+    ["CardCountingPlayer", "Index", "IndexStrategy"]]
+
+
+def table_roster(n_seats: int, bankroll: int = 10 ** 9) -> list[list]:
+    """n_seats seats, alternating BENCH_SEATS."""
+    return [[player_type, f"{name} {i + 1}", strategy, bankroll]
+            for i, (player_type, name, strategy) in ((i, BENCH_SEATS[i % len(BENCH_SEATS)]) for i in range(n_seats))]
+
+
+def benchmark(engine, n_rounds: int, seed: int = 0, reference=Round, n_seats: int = None) -> None:
+    """Time reference and engine on the same seed, side by side (DEFAULT_ROSTER, or a table_roster of n_seats)."""
+    roster = None if n_seats is None else table_roster(n_seats)
+    reference_time = time_engine(reference, n_rounds, seed, roster)
+    engine_time = time_engine(engine, n_rounds, seed, roster)
+    print(f"\n{'Engine':<24} | {'Seconds':>8} | {'Rounds/sec':>10}")
+    print("-" * 25 + "+" + "-" * 10 + "+" + "-" * 11)
+    for engine_class, seconds in ((reference, reference_time), (engine, engine_time)):
+        print(f"{engine_class.__name__:<24} | {seconds:>8.2f} | {n_rounds / seconds:>10.0f}")
+    print(f"\n{engine.__name__} is {reference_time / engine_time:.2f}x {reference.__name__}'s speed.\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record and replay golden traces of the reference engine.")
+    parser.add_argument("mode", choices=["record", "replay", "bench"])
+    parser.add_argument("path", nargs="?", default="golden.jsonl")
+    parser.add_argument("--rounds", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", default="sim_round:SimRound", help="module:Class of the engine to check.")
+    parser.add_argument("--reference", default="round:Round", help="bench: module:Class to time the engine against.")
+    parser.add_argument("--seats", type=int, default=None, help="bench: seats at the table (default: DEFAULT_ROSTER).")
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        print(f"Wrote {record(args.path, args.rounds, args.seed)} rounds to {args.path}")
+    elif args.mode == "replay":
+        print_divergence(replay(args.path, load_engine(args.engine)), args.engine)
+    else:
+        benchmark(load_engine(args.engine), args.rounds, args.seed, load_engine(args.reference), args.seats)
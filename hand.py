@@ -1,9 +1,16 @@
 from deck import Card
+from actions import Action, Outcome
+from array import array
 
 class Hand:
+    # Slots keep per-hand history cheap, since we make a lot of these over a long sim.
+    __slots__ = ("cards", "bet", "actions", "outcome")
+
     def __init__(self):
         self.cards: list[Card] = []
         self.bet: int         
+        self.actions = array("B")            # Action codes taken on this hand, in order.
+        self.outcome: Outcome | None = None  # Set on bust, Blackjack, or when bets are resolved.
 
     def hand_total(self) -> int:
         """Compute hand value considering Aces as 1 or 11."""
@@ -25,10 +32,23 @@ class Hand:
 
     def add_card(self, card: Card) -> None:
         self.cards.append(card)
+
+    def record(self, action: Action) -> None:
+        self.actions.append(action)
+
+    def last_action(self) -> Action | None:
+        return Action(self.actions[-1]) if self.actions else None
+
+    def history_labels(self) -> list[str]:
+        """Human readable history (actions, then outcome if there is one). Only for printing."""
+        labels = [Action(a).label for a in self.actions]
+        if self.outcome is not None:
+            labels.append(self.outcome.label)
+        return labels
     
     def is_pair(self) -> bool:
         return len(self.cards) == 2 and self.cards[0].value == self.cards[1].value
 
     def has_busted(self) -> bool:
         """Has this hand gone over 21?"""
-        return self.hand_total() > 21
\ No newline at end of file
+        return self.hand_total() > 21
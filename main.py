@@ -1,9 +1,21 @@
 from manager import Manager
 from messages import Messages
 from session import Session
-from player import Player, Players, HumanStrategy, BasicStrategy, CardCountingPlayer
+from player import Player, Players, HumanStrategy, IndexStrategy, CardCountingPlayer
+from stats import TrueCountStats
+from shoe import Shoe
+from wonging import WongSession
+from tournament import run_tournament, print_leaderboard
+from metrics import serve_metrics
+from audit import DecisionAudit
 
 MAX_ROUNDS = 10000000
+MAX_TABLES = 100
+MAX_MATCHES = 10000
+COLLECT_TC_STATS = False # Set True to print edge/variance per true count after a sim.
+AUDIT_DECISIONS = False  # Set True to print chart cells where another action did better (needs NumPy).
+SHOE_CORPUS = None       # Path to a file made by corpus.py, to deal sims from pre-shuffled shoes.
+METRICS_PORT = None      # e.g., 9100 to serve live sim metrics on localhost:9100/metrics (Prometheus format).
 
 if __name__ == "__main__":
 
@@ -14,7 +26,7 @@ if __name__ == "__main__":
     # print(f"\n{Messages.WELCOME_MESSAGE}")
     start_choice = Manager.handle_input(
         Messages.START_CHOICE_MESSAGE, 
-        choices=["play", "game", "sim"], 
+        choices=["play", "game", "sim", "wong", "tournament"], 
         input_type=str, 
         invalid_message="That wasn't one of the choices.")
 
@@ -28,14 +40,46 @@ if __name__ == "__main__":
         session = Session(Players.ROSTER)
         session.play_session()
 
+    elif start_choice == "wong":
+        n_tables = Manager.handle_input(
+            Messages.N_TABLES,
+            input_type=int,
+            validator=lambda x: 1<=x<=MAX_TABLES,
+            invalid_message=f"Please choose a number between 1 and {MAX_TABLES}")
+        n_rounds = Manager.handle_input(
+            Messages.N_ROUNDS, 
+            input_type=int, 
+            validator=lambda x: 1<=x<=MAX_ROUNDS,
+            invalid_message=f"Please choose a number between 1 and {MAX_ROUNDS}")
+        wong_session = WongSession(CardCountingPlayer("The Pro", IndexStrategy()), n_rounds, n_tables,
+                                   tc_stats=TrueCountStats() if COLLECT_TC_STATS else None)
+        wong_session.play_session()
+
+    elif start_choice == "tournament":
+        n_matches = Manager.handle_input(
+            Messages.N_MATCHES,
+            input_type=int,
+            validator=lambda x: 1<=x<=MAX_MATCHES,
+            invalid_message=f"Please choose a number between 1 and {MAX_MATCHES}")
+        n_rounds = Manager.handle_input(
+            Messages.N_ROUNDS, 
+            input_type=int, 
+            validator=lambda x: 1<=x<=MAX_ROUNDS,
+            invalid_message=f"Please choose a number between 1 and {MAX_ROUNDS}")
+        shoe = {"corpus_path": SHOE_CORPUS} if SHOE_CORPUS else None
+        print_leaderboard(run_tournament(n_matches, n_rounds, shoe=shoe))
+
     else: # sim
-        Players.ROSTER.append(CardCountingPlayer("The Pro", BasicStrategy())) # Human always at last "seat" of "table"
+        Players.ROSTER.append(CardCountingPlayer("The Pro", IndexStrategy())) # Human always at last "seat" of "table"
         n_rounds = Manager.handle_input(
             Messages.N_ROUNDS, 
             input_type=int, 
             validator=lambda x: 1<=x<=MAX_ROUNDS,
             invalid_message=f"Please choose a number between 1 and {MAX_ROUNDS}")
-        session = Session(Players.ROSTER, n_rounds)
+        shoe = Shoe(corpus_path=SHOE_CORPUS) if SHOE_CORPUS else None
+        session = Session(Players.ROSTER, n_rounds, TrueCountStats() if COLLECT_TC_STATS else None, shoe=shoe,
+                          audit=DecisionAudit() if AUDIT_DECISIONS else None)
+        if METRICS_PORT: serve_metrics(session, METRICS_PORT)
         session.play_session()
 
 
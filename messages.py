@@ -15,11 +15,15 @@ class Messages:
     START_CHOICE_MESSAGE = """You can:
   - Play a game (play)
   - Run a simulation (sim)
+  - Back-count a room full of tables (wong)
+  - Pit every strategy against the same shoes (tournament)
   - Quit at any time (quit)
 """
 
     WELCOME_MESSAGE = "Welcome to Blackjack Lab! I hope fate is on your side..."
     N_ROUNDS = "Select a number of rounds to simulate: "
+    N_TABLES = "Select a number of tables to watch: "
+    N_MATCHES = "Select a number of matches per strategy: "
     NAME_REQUEST = "What's your name: "
 
     ASCII_TITLE = r"""
@@ -0,0 +1,122 @@
+"""Live metrics for long sims, served on localhost in Prometheus text format.
+
+    session = Session(Players.ROSTER, n_rounds)
+    serve_metrics(session, 9100)   # then: curl localhost:9100/metrics
+    session.play_session()
+
+The sim thread only bumps a few counters per round (SessionMetrics.record_round). Everything else
+(rates, ETA, bankrolls, drawdowns) is worked out by the server thread when it's scraped, from plain
+attribute reads, so the hot loop never waits on a lock.
+"""
+
+import http.server
+import threading
+import time
+
+from stats import MIN_TC, MAX_TC, N_BUCKETS
+
+
+class SessionMetrics:
+    """Counters for one Session. Attached as session.metrics, which makes Session.iter_rounds call record_round."""
+
+    def __init__(self, session):
+        self.session = session
+        self.started = time.time()
+        self.rounds = 0
+        self.tc_rounds = [0] * N_BUCKETS # Rounds played at each true count (at bet time), clamped like stats.py.
+        self.max_drawdowns = {player: 0 for player in session.max_bankrolls}
+        self.last_scrape = (self.started, 0) # (time, rounds), for the "recent" rate.
+
+
+    def record_round(self, true_count: int) -> None:
+        self.rounds += 1
+        self.tc_rounds[min(max(true_count, MIN_TC), MAX_TC) - MIN_TC] += 1
+        max_drawdowns = self.max_drawdowns
+        for player, max_bankroll in self.session.max_bankrolls.items():
+            drawdown = max_bankroll - player.bankroll
+            if drawdown > max_drawdowns[player]:
+                max_drawdowns[player] = drawdown
+
+
+    def render(self) -> str:
+        """Current snapshot, in Prometheus text exposition format."""
+        session = self.session
+        now = time.time()
+        rounds = self.rounds
+        elapsed = now - self.started
+        last_time, last_rounds = self.last_scrape
+        self.last_scrape = (now, rounds)
+        rate = rounds / elapsed if elapsed > 0 else 0.0
+        recent_rate = (rounds - last_rounds) / (now - last_time) if now > last_time else 0.0
+
+        lines = []
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP blackjack_{name} {help_text}")
+            lines.append(f"# TYPE blackjack_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"blackjack_{name}{labels} {value}")
+
+        metric("rounds_total", "counter", "Rounds played so far.", [("", rounds)])
+        metric("rounds_target", "gauge", "Rounds the session will play (0 if open ended).", [("", session.n_rounds or 0)])
+        metric("rounds_per_second", "gauge", "Average rounds per second since the sim started.", [("", f"{rate:.3f}")])
+        metric("rounds_per_second_recent", "gauge", "Rounds per second since the previous scrape.", [("", f"{recent_rate:.3f}")])
+        if session.n_rounds and rate > 0:
+            eta = max(0, session.n_rounds - rounds) / rate
+            metric("eta_seconds", "gauge", "Estimated seconds until the sim finishes.", [("", f"{eta:.1f}")])
+        metric("reshuffles_total", "counter", "Times the shoe was rebuilt at the cut card.", [("", session.shoe.reshuffles)])
+        metric("true_count", "gauge", "Current true count of the shoe.", [("", session.shoe.card_counter.true_count)])
+        metric("true_count_rounds_total", "counter", f"Rounds played at each true count (clamped to {MIN_TC}..{MAX_TC}).",
+               [(f'{{tc="{MIN_TC + i}"}}', n) for i, n in enumerate(self.tc_rounds)])
+
+        seats = [(player, f'{{player="{escape(player.name)}"}}') for player in list(self.max_drawdowns)]
+        metric("bankroll", "gauge", "Current bankroll.", [(labels, player.bankroll) for player, labels in seats])
+        metric("max_bankroll", "gauge", "Highest bankroll so far.",
+               [(labels, session.max_bankrolls[player]) for player, labels in seats])
+        metric("drawdown", "gauge", "Current drop from the highest bankroll.",
+               [(labels, session.max_bankrolls[player] - player.bankroll) for player, labels in seats])
+        metric("max_drawdown", "gauge", "Largest drop from a previous high so far.",
+               [(labels, self.max_drawdowns[player]) for player, labels in seats])
+        return "\n".join(lines) + "\n"
+
+
+def escape(label: str) -> str:
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsServer:
+    """Serves metrics.render() on http://host:port/metrics from a daemon thread."""
+
+    def __init__(self, metrics: SessionMetrics, port: int = 9100, host: str = "127.0.0.1"):
+        self.metrics = metrics
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass # Don't print over the sim's output.
+
+        self.server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.address = self.server.server_address # Actual port, if port=0 was passed.
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def serve_metrics(session, port: int = 9100, host: str = "127.0.0.1") -> MetricsServer:
+    """Start collecting metrics for session and serve them. The server dies with the process."""
+    session.metrics = SessionMetrics(session)
+    return MetricsServer(session.metrics, port, host)
@@ -7,27 +7,17 @@ in functions as strings until everything is defined)."""
 
 import random
 from manager import Manager
+from actions import Action, Outcome, ChartCode, CHAR_TO_CODE, INPUT_TO_ACTION
 from deck import Card
 from hand import Hand
 from counter import CardCounter
+from side_bets import SideBet, SIDE_BETS
+import rules
 from abc import ABC, abstractmethod
 from collections import deque
 import csv
 
 
-"""Used to convert from CSV move to game readable move (so printed tables don't have letters, 
-even though they are valid for humans to type as moves for convenience)."""
-CHAR_TO_WORD = {
-    "H":"hit",
-    "S":"stand",
-    "D":"double",
-    "Ds":"double_if_possible_else_stand", # Double if possible, otherwise stand
-    "Y": "yes_split",
-    "N": "no_split",
-    "Yn": "split_if_double_after_split"
-}
-
-
 def csv_to_dict(path: str, row_header_title: str) -> dict:
     d = {}
     with open(path) as csv_file:
@@ -38,10 +28,49 @@ def csv_to_dict(path: str, row_header_title: str) -> dict:
         return d
 
 
-# Dicts constructed from csv files. 
-hard_totals = csv_to_dict("./tables/hard-totals.csv", "Player Total")
-soft_totals = csv_to_dict("./tables/soft-totals.csv", "Player Total")
-pair_splitting = csv_to_dict("./tables/pair-splitting.csv", "Player Pair")
+def chart_from_csv(path: str, row_header_title: str) -> dict[str, dict[str, ChartCode]]:
+    """Like csv_to_dict, but cells are converted to ChartCode ints once, at load time."""
+    return {row: {dk: CHAR_TO_CODE[char] for dk, char in cells.items()} 
+            for row, cells in csv_to_dict(path, row_header_title).items()}
+
+
+# Charts constructed from csv files. 
+hard_totals = chart_from_csv("./tables/hard-totals.csv", "Player Total")
+soft_totals = chart_from_csv("./tables/soft-totals.csv", "Player Total")
+pair_splitting = chart_from_csv("./tables/pair-splitting.csv", "Player Pair")
+CHARTS = {"hard": hard_totals, "soft": soft_totals, "pair": pair_splitting}
+
+# Range of true counts an index table is compiled for. Counts outside are clamped to the ends.
+INDEX_MIN_TC = -10
+INDEX_MAX_TC = 10
+
+
+def compile_index_table(path: str) -> dict[tuple[str, str, str, int], ChartCode]:
+    """Build a (chart, row, dealer key, true count) -> ChartCode table from a deviations CSV
+    (see tables/deviations.csv). Every chart cell gets an entry for every true count in
+    [INDEX_MIN_TC, INDEX_MAX_TC], so a count-aware decision is still one dict lookup.
+
+    A deviation row replaces the chart cell when the true count is >= (or <=, per the "When"
+    column) its index. Later rows win if two deviations overlap."""
+    with open(path) as csv_file:
+        deviations = [{k.strip(): v.strip() for k, v in row.items()} for row in csv.DictReader(csv_file)]
+
+    table = {}
+    for chart_name, chart in CHARTS.items():
+        for row, cells in chart.items():
+            for dk, code in cells.items():
+                for tc in range(INDEX_MIN_TC, INDEX_MAX_TC + 1):
+                    table[chart_name, row, dk, tc] = code
+
+    for dev in deviations:
+        index = int(dev["Index"])
+        for tc in range(INDEX_MIN_TC, INDEX_MAX_TC + 1):
+            if (tc >= index) if dev["When"] == ">=" else (tc <= index):
+                key = (dev["Chart"], dev["Player Total"], dev["Dealer"], tc)
+                if key not in table:
+                    raise ValueError(f"Deviation {dev} doesn't match any chart cell.")
+                table[key] = CHAR_TO_CODE[dev["Play"]]
+    return table
 
 
 def dealer_key(card: Card) -> str:
@@ -60,13 +89,15 @@ class Player:
         self.strategy = strategy
         self.bankroll = bankroll
         self.initial_bankroll = bankroll
-        self.hands_collection: deque # Constructed at the beginning of each round... Somewhat wasteful. Could fix.
+        self.hands_collection: deque = deque()  # Reset at the beginning of each round.
         self.current_hand: Hand                 
-        self.final_hands: list[Hand]
-        self.per_hand_result: dict[Hand: list[str]]
+        self.final_hands: list[Hand] = []       # Each Hand carries its own action history and outcome.
+        self.side_bets: list[SideBet] = []      # Optional (see side_bets.py), e.g., [PerfectPairs(5)]
+        self.side_wagers: list[int] = []        # This round's wager for each side bet.
+        self.side_net = 0                       # This round's side bet result (returned minus wagered).
 
 
-    def make_decision(self, dealer_upcard: Card) -> str:
+    def make_decision(self, dealer_upcard: Card) -> Action:
         return self.strategy.make_decision(self, dealer_upcard)
     
 
@@ -83,7 +114,7 @@ class Player:
     # FORMERLY: valid_split
     def can_split(self) -> bool:
         """Casino Convention: No more than 4 hands per round, per player."""
-        return len(self.hands_collection) < 4 and self.can_double() and self.current_hand.is_pair() # Splitting effectively doubles your bet.
+        return len(self.hands_collection) < rules.MAX_HANDS and self.can_double() and self.current_hand.is_pair() # Splitting effectively doubles your bet.
         # NOTE: Now checking if pair also...
         # This might not be the best design... it opens opportunity for errors I feel.
     
@@ -99,7 +130,7 @@ class Player:
         if self.current_hand.has_busted():
             # self.bankroll -= self.current_hand.bet # make sure not doubling...
             # self.current_hand.bet = 0 # might not need this line.
-            self.per_hand_result[self.current_hand].append("bust")
+            self.current_hand.outcome = Outcome.BUST
             return True
         return False
     
@@ -116,10 +147,20 @@ class CardCountingPlayer(Player):
 
 class Strategy(ABC):
     """Strategy is an abstract base class (inherited by every Player object)."""
+
+    # True if make_decisions can answer for many seats at once. Only safe when a decision depends on
+    # nothing but that seat's own hand/bankroll and the dealer upcard (no RNG, no running count), and
+    # the strategy keeps no per-instance config (any instance may answer for every seat of its class).
+    batchable = False
+
     @abstractmethod
-    def make_decision(self, player: Player, dealer_upcard: Card) -> str:
+    def make_decision(self, player: Player, dealer_upcard: Card) -> Action:
         pass
 
+    def make_decisions(self, players: list[Player], dealer_upcard: Card) -> list[Action]:
+        """Batch version of make_decision: one decision per player, for their current hand."""
+        return [self.make_decision(player, dealer_upcard) for player in players]
+
     @abstractmethod
     def make_bet(self, player: Player) -> int:
         pass
@@ -129,8 +170,8 @@ class Strategy(ABC):
 
 class RandomStrategy(Strategy):
     """Random choice (but stands at 21)."""
-    def make_decision(self, player, dealer_upcard) -> str:
-        return "stand" if player.current_hand.hand_total() == 21 else random.choice(["hit", "stand"])
+    def make_decision(self, player, dealer_upcard) -> Action:
+        return Action.STAND if player.current_hand.hand_total() == 21 else random.choice([Action.HIT, Action.STAND])
 
     def make_bet(self, player) -> int:
         # Random bet between 10% and 25% of bankroll.
@@ -139,10 +180,16 @@ class RandomStrategy(Strategy):
 
 class RationalStrategy(Strategy):
     """Follows dealer logic, stands at 17 or more."""
-    def make_decision(self, player, dealer_upcard) -> str:
+    batchable = True
+
+    def make_decision(self, player, dealer_upcard) -> Action:
         if player.current_hand.hand_total() < 17:
-            return "hit"
-        return "stand"
+            return Action.HIT
+        return Action.STAND
+
+    def make_decisions(self, players, dealer_upcard) -> list[Action]:
+        return [Action.HIT if player.current_hand.hand_total() < 17 else Action.STAND for player in players]
+
     def make_bet(self, player) -> int:
         return max(1, int(player.bankroll * 0.05 // 1)) # Bets 5% of bankroll
 
@@ -156,18 +203,25 @@ class RationalOptimistStrategy(RationalStrategy):
 
 class DoublerStrategy(Strategy):
     """Double instead of hit, every valid time."""
-    def make_decision(self, player, dealer_upcard) -> str:
+    batchable = True
+
+    def make_decision(self, player, dealer_upcard) -> Action:
         if player.current_hand.hand_total() < 17:
-            return "double" if player.can_double() else "hit"
-        return "stand"
+            return Action.DOUBLE if player.can_double() else Action.HIT
+        return Action.STAND
+
+    def make_decisions(self, players, dealer_upcard) -> list[Action]:
+        return [Action.STAND if player.current_hand.hand_total() >= 17
+                else Action.DOUBLE if player.can_double() else Action.HIT for player in players]
+
     def make_bet(self, player) -> int:
         return max(1, int(player.bankroll * 0.20 // 1)) # Bets 20% of bankroll
 
 
 class HumanStrategy(Strategy):
     """HumanStrategy... the fate of the game is left in your mortal hands! But forced to stand at 21."""
-    def make_decision(self, player, dealer_upcard) -> str:
-        if player.current_hand.hand_total() == 21: return "stand"   # Force stand by "dealer"
+    def make_decision(self, player, dealer_upcard) -> Action:
+        if player.current_hand.hand_total() == 21: return Action.STAND   # Force stand by "dealer"
                                                                     # NOTE: Is this already handled in Round class?
         
         choices = ["hit", "h", "stand", "s"]
@@ -182,11 +236,12 @@ class HumanStrategy(Strategy):
                 choice_indicator = "Hit, double, split or stand?"
 
 
-        return Manager.handle_input(
+        choice = Manager.handle_input(
             message=f"Your hand: {player.current_hand.cards} (Score: {player.current_hand.hand_total()}), dealer shows {dealer_upcard}. {choice_indicator} ",
             choices=choices,
             input_type=str,
             invalid_message="That wasn't a valid play.")
+        return INPUT_TO_ACTION[choice]
 
     def make_bet(self, player) -> int:
         return Manager.handle_input(
@@ -198,7 +253,26 @@ class HumanStrategy(Strategy):
 
 class BasicStrategy(Strategy):
     """Note that "Basic Strategy" is a specific Blackjack strategy that makes the best move based on dealer upcard and their own hand total."""
-    def make_decision(self, player, dealer_upcard) -> str:
+    batchable = True
+
+    # Two-card decisions, keyed by (low card value, high card value, dealer key, can double, can split).
+    # Filled in lazily from make_decision, so it can never disagree with it. One per class (see below).
+    two_card_table: dict[tuple, Action] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.two_card_table = {} # A subclass's answers are its own, never its parent's.
+        # Overriding lookup means the chart alone no longer decides (e.g., IndexStrategy reads the count),
+        # so a subclass that does is only batchable if it says so itself.
+        if "lookup" in cls.__dict__ and "batchable" not in cls.__dict__:
+            cls.batchable = False
+
+    def lookup(self, player: Player, chart: str, row: str, dk: str) -> ChartCode:
+        """Single chart lookup. Subclasses can override to take more than the cards into account."""
+        return CHARTS[chart][row][dk]
+
+
+    def make_decision(self, player, dealer_upcard) -> Action:
         hand_total = player.current_hand.hand_total()
 
         # Commented out to handle after some sort of is pair determination.
@@ -209,17 +283,16 @@ class BasicStrategy(Strategy):
 
         if player.can_split():
             pair_str = f"{dealer_key(player.current_hand.cards[0])}{dealer_key(player.current_hand.cards[1])}" # I guess could just do * 2.
-            split_char = pair_splitting[pair_str][dk]
-            decision_split = CHAR_TO_WORD[split_char]
+            split_code = self.lookup(player, "pair", pair_str, dk)
 
-            print(f"DEBUG: Decision to split: {decision_split} with {player.current_hand.cards} and DK: {dk}")
-            print(f"DEBUG: Bankroll: ${player.bankroll}, Cur bet: {player.current_hand.bet}")
-            if len(player.hands_collection) > 4:
+            # print(f"DEBUG: Decision to split: {split_code.name} with {player.current_hand.cards} and DK: {dk}")
+            # print(f"DEBUG: Bankroll: ${player.bankroll}, Cur bet: {player.current_hand.bet}")
+            if len(player.hands_collection) > rules.MAX_HANDS:
                 raise RuntimeError # Greater than allowed amount of hands bug.
              
             # We allow double after split. Takes away some house advantage (like 0.2% or something).
-            if decision_split in ["yes_split", "split_if_double_after_split"]:    
-                return "split"
+            if split_code in (ChartCode.SPLIT, ChartCode.SPLIT_IF_DAS):    
+                return Action.SPLIT
             
         # If soft hand (could refactor to Hand class, when implemented).
         if any(c.rank == "A" for c in player.current_hand.cards) and len(player.current_hand.cards) == 2:
@@ -234,26 +307,47 @@ class BasicStrategy(Strategy):
             try: 
                 other_card = next(c for c in player.current_hand.cards if c.rank != "A")
             except StopIteration:
-                return "hit" # Always split on two aces, for now hit.
+                return Action.HIT # Always split on two aces, for now hit.
 
 
             # Because the CSV is more readable as just short values (i.e., "H", "D")
             # But this looks bad in CLI.
             soft_total_repr = "A" + str(other_card.value)
-            char = soft_totals[soft_total_repr][dk]
+            code = self.lookup(player, "soft", soft_total_repr, dk)
 
         else:
-            if hand_total <= 7: return "hit" # Already need to have determined if pair or not (using split/pair logic) for this to be sound.
+            if hand_total <= 7: return Action.HIT # Already need to have determined if pair or not (using split/pair logic) for this to be sound.
             row_key = "17+" if hand_total >= 17 else str(hand_total)
-            char = hard_totals[row_key][dk]
+            code = self.lookup(player, "hard", row_key, dk)
 
-        decision = CHAR_TO_WORD[char]
+        if code == ChartCode.DOUBLE and not player.can_double():
+            return Action.HIT
+        elif code == ChartCode.DOUBLE_ELSE_STAND:
+            return Action.DOUBLE if player.can_double() else Action.STAND
+        return Action(code)
 
-        if decision == "double" and not player.can_double():
-            return "hit"
-        elif decision == "double_if_possible_else_stand":
-            return "double" if player.can_double() else "stand"
-        return decision
+
+    def make_decisions(self, players, dealer_upcard) -> list[Action]:
+        """Two-card hands (which is every hand, for the first decision of a round) are answered from
+        two_card_table, everything else falls back to make_decision. Unbatchable subclasses skip the table."""
+        if not self.batchable:
+            return super().make_decisions(players, dealer_upcard)
+        dk = dealer_key(dealer_upcard)
+        table = self.two_card_table
+        decisions = []
+        for player in players:
+            cards = player.current_hand.cards
+            if len(cards) != 2:
+                decisions.append(self.make_decision(player, dealer_upcard))
+                continue
+            v1, v2 = cards[0].value, cards[1].value
+            low, high = (v1, v2) if v1 <= v2 else (v2, v1)
+            key = (low, high, dk, player.can_double(), player.can_split())
+            decision = table.get(key)
+            if decision is None:
+                decision = table[key] = self.make_decision(player, dealer_upcard)
+            decisions.append(decision)
+        return decisions
 
 
     # TODO: Make this the best it can be.
@@ -268,6 +362,23 @@ class BasicStrategy(Strategy):
         
         return min(player.bankroll, table_min * units)
 
+
+class IndexStrategy(BasicStrategy):
+    """Basic Strategy plus count-based deviations ("index plays", e.g., the Illustrious 18).
+    Reads the true count from CardCountingPlayer.card_counter, so only use it with one of those.
+    Not batchable, since it overrides lookup: decisions move with the count, which changes as other
+    seats are dealt cards."""
+
+    def __init__(self, deviations_path: str = "./tables/deviations.csv"):
+        self.deviations_path = deviations_path
+        self.table = compile_index_table(deviations_path)
+
+    def lookup(self, player, chart, row, dk) -> ChartCode:
+        tc = player.card_counter.true_count
+        if tc < INDEX_MIN_TC: tc = INDEX_MIN_TC
+        elif tc > INDEX_MAX_TC: tc = INDEX_MAX_TC
+        return self.table[chart, row, dk, tc]
+
 class Players:
     # ROSTER = [
     #     Player("The Pro", BasicStrategy()),
@@ -276,3 +387,32 @@ class Players:
     # ]
 
     ROSTER = []
+
+    # Every strategy (and player type) by name, so rosters can be described in plain data ("specs")
+    # and rebuilt elsewhere, e.g., in another process or on another machine.
+    STRATEGIES = {cls.__name__: cls for cls in (
+        RandomStrategy, RationalStrategy, RationalOptimistStrategy, DoublerStrategy,
+        HumanStrategy, BasicStrategy, IndexStrategy)}
+    PLAYER_TYPES = {cls.__name__: cls for cls in (Player, CardCountingPlayer)}
+
+    @staticmethod
+    def to_spec(players: list[Player]) -> list[list]:
+        """[player type, name, strategy, initial bankroll] per player, plus [[side bet, amount, min_ev], ...]
+        for players with side bets. Strategies are rebuilt with default arguments."""
+        spec = []
+        for p in players:
+            row = [type(p).__name__, p.name, type(p.strategy).__name__, p.initial_bankroll]
+            if p.side_bets:
+                row.append([[type(b).__name__, b.amount, b.min_ev] for b in p.side_bets])
+            spec.append(row)
+        return spec
+
+    @staticmethod
+    def from_spec(spec: list[list]) -> list[Player]:
+        players = []
+        for player_type, name, strategy, bankroll, *side_bets in spec:
+            player = Players.PLAYER_TYPES[player_type](name, Players.STRATEGIES[strategy](), bankroll)
+            if side_bets:
+                player.side_bets = [SIDE_BETS[kind](amount, min_ev) for kind, amount, min_ev in side_bets[0]]
+            players.append(player)
+        return players
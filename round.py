@@ -3,6 +3,11 @@ from manager import Manager
 from shoe import Shoe
 from deck import Card
 from hand import Hand
+from actions import Action, Outcome
+from stats import TrueCountStats
+from audit import DecisionAudit
+from side_bets import place_side_bets, settle_side_bets
+import rules
 from collections import deque
 
 
@@ -12,15 +17,15 @@ BANNER_LEN = 45 # amount of "=" that prints is multiplied by this constant (for
 class Round:
     """Defines a single Blackjack round."""
 
-    def __init__(self, players: list[Player], shoe: Shoe, round_number: int, interactive: bool):
+    def __init__(self, players: list[Player], shoe: Shoe, round_number: int, interactive: bool,
+                 tc_stats: TrueCountStats | None = None, audit: DecisionAudit | None = None):
         self.players = players
         self.shoe = shoe
         self.round_number = round_number
         self.interactive = interactive
+        self.tc_stats = tc_stats # Optional, only filled in if a collector is passed in.
+        self.audit = audit       # Optional decision-outcome cube (see audit.py).
         self.dealer_hand: Hand
-        self.decisions = {player: [] for player in self.players}
-        # TODO: Refactor to per-hand dict, per player (in player object, I think... or maybe separate object to track data?)
-        # Whatever is best for matplotlib usage, or simply, whatever is best for large amount of rounds.
 
 
     def dealer_upcard(self) -> Card:
@@ -43,7 +48,6 @@ class Round:
         """Deal initial hands for all players."""
         for player in self.players:
             
-            player.per_hand_result = {}
             player.final_hands = []
             player.hands_collection = deque()
 
@@ -65,17 +69,20 @@ class Round:
                 if dealer_total == 21:
                     # Push (tie with dealer) Blackjack, very rare!
                     player.bankroll += player.current_hand.bet # add back
-                    player.per_hand_result[player.current_hand] = ["push blackjack"]
+                    player.current_hand.outcome = Outcome.PUSH_BLACKJACK
 
                 else:
                     # Blackjack, Player wins 3:2 their bet
-                    player.per_hand_result[player.current_hand] = ["blackjack"]
-                    player.bankroll += int(2.5 * player.current_hand.bet)
+                    player.current_hand.outcome = Outcome.BLACKJACK
+                    player.bankroll += rules.blackjack_return(player.current_hand.bet)
                 player.hands_collection.clear() # Round over for player.
 
     
     def player_turns_with_split(self) -> None:
         """A method that supports splitting hands."""
+        if self.audit is not None:
+            self.audit_starts = self.audit.starts(self.players, self.dealer_upcard())
+
         for player in self.players:
             
             # Human player is always at last seat of "table", therefore they can see everything thus far.
@@ -83,19 +90,18 @@ class Round:
 
             while player.hands_collection:
                 player.current_hand = player.hands_collection.popleft()
-                player.per_hand_result[player.current_hand] = []
 
                 while True:
 
                     if player.current_hand.hand_total() == 21:
-                        decision = "stand"
+                        decision = Action.STAND
                     else:
                         decision = player.make_decision(self.dealer_upcard()) # And need to ensure make_decision correctly uses parameter current_hand.
 
                     match decision:
-                        case "hit" | "h":
+                        case Action.HIT:
                             player.current_hand.add_card(self.shoe.deal_card()) # Could simplify this syntax length-wise for all calls probably.
-                            player.per_hand_result[player.current_hand].append("hit") # Is this okay?
+                            player.current_hand.record(Action.HIT)
 
                             if player.handle_bust():
                                 player.record_cur_hand()
@@ -103,14 +109,14 @@ class Round:
 
                             continue
 
-                        case "stand" | "s":
+                        case Action.STAND:
                             # Don't really need to add "stand" to history, at least for display purposes...
-                            player.per_hand_result[player.current_hand].append("stand")
+                            player.current_hand.record(Action.STAND)
 
                             player.record_cur_hand()
                             break
                         
-                        case "double" | "d":
+                        case Action.DOUBLE:
                             if not player.can_double():
                                
                                 # NOTE: Pretty sure fixed bug so that this won't happen anymore.
@@ -128,18 +134,18 @@ class Round:
                             if player.bankroll == 0: print("You're all in!")
                             
                             player.current_hand.add_card(self.shoe.deal_card())
-                            player.per_hand_result[player.current_hand].append("double")
+                            player.current_hand.record(Action.DOUBLE)
 
                             if player.handle_bust():
                                 player.record_cur_hand()
                                 break
 
                            # After doubling, you MUST stand
-                            player.per_hand_result[player.current_hand].append("stand")  # Add stand to history
+                            player.current_hand.record(Action.STAND)  # Add stand to history
                             player.record_cur_hand()
                             break
 
-                        case "split":
+                        case Action.SPLIT:
                             can_split = player.can_split()
                             is_pair = player.current_hand.is_pair()
                             
@@ -165,7 +171,7 @@ class Round:
                                 player.hands_collection.appendleft(new_hand2)
                                 player.hands_collection.appendleft(new_hand1)
 
-                                player.per_hand_result[player.current_hand].append("split")
+                                player.current_hand.record(Action.SPLIT)
                                 player.record_cur_hand() # Because we used popleft to access current hand.
 
                                 all_hands = ", ".join(str(h.cards) for h in player.hands_collection)
@@ -200,31 +206,25 @@ class Round:
             for hand in player.final_hands:
 
                 hand_total = hand.hand_total()
-                hand_result = player.per_hand_result[hand][-1] # Last result for hand. This isn't such a good line.
-
-                if hand_result in ["stand", "hit"]: # would ever be hit? I don't think so...
-                    # Bust logic already handled by this point.
-                    if (hand_total > dealer_total) or (dealer_total > 21 and hand_total < 21):
-                        player.bankroll += (hand.bet * 2)
-                        player.per_hand_result[hand].append("wins")
-                    elif hand_total == dealer_total:
-                        player.bankroll += hand.bet
-                        player.per_hand_result[hand].append("push")
-                    else:
-                        player.per_hand_result[hand].append("loses")
 
-                hand_result = player.per_hand_result[hand][-1] # Last result for hand.
+                # Busted hands already have an outcome, and split hands were replaced by their two new hands.
+                if rules.is_live(hand):
+                    hand.outcome = rules.settle(hand_total, dealer_total)
+                    player.bankroll += hand.bet * rules.PAYOUT_MULTIPLIER[hand.outcome]
 
                 # TODO: Implement table print method instead of this placeholder.
-                if hand_result == "split":
-                    print(f"{player.name} {hand_result} a ${hand.bet} hand...")
+                if hand.outcome is None: # Split
+                    print(f"{player.name} {Action.SPLIT.label} a ${hand.bet} hand...")
                 else:
-                    print(f"{player.name} {hand_result} ${hand.bet}")
+                    print(f"{player.name} {hand.outcome.label} ${hand.bet}")
 
                     # DEBUG
                     print(f"Player: {hand.cards}, ({hand_total})")
                     print(f"Dealer: {self.dealer_hand.cards}, ({dealer_total})")
 
+        if self.audit is not None:
+            self.audit.record(self.audit_starts)
+
 
     def play_round(self):
         """Handles core round logic. I've tried to provide an ample amount of comments, mainly
@@ -237,6 +237,10 @@ class Round:
 
         print(f"\nRound Number {self.round_number}")
 
+        if self.tc_stats is not None:
+            bet_true_count = self.shoe.card_counter.true_count
+            bankrolls_before = [player.bankroll for player in self.players]
+
         # --- Take Bets ---
         for player in self.players:
             player.current_hand = Hand()
@@ -245,6 +249,9 @@ class Round:
             if player.bankroll < 0: 
                 print(f"ERROR: player bankroll {player.bankroll}")
                 raise RuntimeError
+
+        # Optional side bets (Perfect Pairs, 21+3), settled right after the deal.
+        place_side_bets(self.players, self.shoe)
         
         # Print the bets table.
         self.print_bets()
@@ -252,9 +259,14 @@ class Round:
         # Deal initial hands to players.
         self.deal_initial_hands()
         
+        settle_side_bets(self.players, self.dealer_upcard())
+
         # Print the initial deal table.
         self.print_initial_deal()
 
+        if self.tc_stats is not None:
+            initial_bets = [player.current_hand.bet for player in self.players]
+
         # Check for player Blackjack's. Player wins 3:2 their bet.
         self.initial_blackjack_check()
 
@@ -268,7 +280,10 @@ class Round:
             self.shoe.card_counter.update_counts(hole_card, self.shoe.decks_remaining())
         
         dealer_total = self.dealer_hand.hand_total() # TODO: Why calling twice? Messy. Fix. I guess need to though.
-        while dealer_total < 17: # Casino Convention: most dealers stand at 17 (soft or hard).
+
+        # Dealer only draws if someone is still waiting on them (not everyone busted or had Blackjack).
+        live = any(rules.is_live(hand) for player in self.players for hand in player.final_hands)
+        while live and rules.dealer_draws(dealer_total):
 
             self.dealer_hand.add_card(self.shoe.deal_card())
             dealer_total = self.dealer_hand.hand_total()
@@ -281,10 +296,13 @@ class Round:
         for player in self.players:
             print(f"{player.name}: ${player.bankroll}")
             for hand in player.final_hands:
-                print(f"  Hand: {hand.cards}, result: {player.per_hand_result[hand]}")
+                print(f"  Hand: {hand.cards}, result: {hand.history_labels()}")
         """ 
     
         self.resolve_bets(dealer_total)
+
+        if self.tc_stats is not None:
+            self.record_tc_stats(bet_true_count, bankrolls_before, initial_bets)
     
         """
         print(f"\nAFTER RESOLVE_BETS:")
@@ -296,6 +314,23 @@ class Round:
         self.shoe.csm_recycle()
 
 
+    def record_tc_stats(self, true_count: int, bankrolls_before: list[int], initial_bets: list[int]) -> None:
+        """Record every player's round in the true count collector. Players are never removed mid-round,
+        so the lists line up with self.players. Side bets are left out: they're reported on their own
+        (see SideBet), and would skew the main game's EV by count."""
+        for player, before, bet in zip(self.players, bankrolls_before, initial_bets):
+            hands = [hand for hand in player.final_hands if hand.last_action() != Action.SPLIT]
+            self.tc_stats.record(
+                true_count,
+                net=player.bankroll - before - player.side_net,
+                bet=bet,
+                hands=len(hands) or 1,
+                blackjack=not player.final_hands, # Only a natural skips the player's turn entirely.
+                doubles=sum(Action.DOUBLE in hand.actions for hand in hands),
+                splits=len(player.final_hands) - len(hands),
+                busts=sum(hand.outcome == Outcome.BUST for hand in hands))
+
+
     # Please forgive my non-DRY (wet, if you will) implementations of the following print methods:
     def print_bets(self) -> None:
         """"""
@@ -347,8 +382,8 @@ class Round:
 
                     hand_str = ", ".join(str(card) for card in hand.cards)
 
-                    # `d` is each str in array of str's as the value of decisions dict, with Player object as key.
-                    decisions_str = ", ".join(d.upper() for d in player.per_hand_result[hand])
+                    # Names are only built here, the hand itself just stores Action/Outcome codes.
+                    decisions_str = ", ".join(d.upper() for d in hand.history_labels())
 
                     # NOTE: I could not print STAND if that's the last dedecision in decision_str (because redundant)
                     print(f"{player.name:<10} | {hand_str:<19}       | {decisions_str}")
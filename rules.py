@@ -0,0 +1,43 @@
+"""Table rules, shared by every round engine (Round, SimRound, ...) so they can't drift apart."""
+
+from actions import Action, Outcome
+from hand import Hand
+
+
+DEALER_STANDS_ON = 17   # Casino Convention: most dealers stand at 17 (soft or hard).
+MAX_HANDS = 4           # Casino Convention: No more than 4 hands per round, per player.
+BLACKJACK_PAYS = 2.5    # Natural pays 3:2, so 2.5x the bet comes back (bet included).
+
+# Shoe keyword arguments for sims that don't ask for anything else (golden traces, tournaments, distributed runs).
+DEFAULT_SHOE = {"deck_count": 6, "penetration": 0.75, "use_csm": False}
+
+# Amount returned per unit bet (bet included) for each settled outcome.
+PAYOUT_MULTIPLIER = {
+    Outcome.WINS: 2,
+    Outcome.PUSH: 1,
+    Outcome.LOSES: 0,
+    Outcome.BUST: 0,
+    Outcome.PUSH_BLACKJACK: 1
+}
+
+
+def blackjack_return(bet: int) -> int:
+    return int(BLACKJACK_PAYS * bet)
+
+
+def dealer_draws(dealer_total: int) -> bool:
+    return dealer_total < DEALER_STANDS_ON
+
+
+def is_live(hand: Hand) -> bool:
+    """A finished hand still waiting on the dealer (i.e., not busted, and not replaced by a split)."""
+    return hand.outcome is None and hand.actions[-1] == Action.STAND
+
+
+def settle(hand_total: int, dealer_total: int) -> Outcome:
+    """Outcome of a live hand against the dealer's final total."""
+    if (hand_total > dealer_total) or (dealer_total > 21 and hand_total <= 21):
+        return Outcome.WINS
+    elif hand_total == dealer_total:
+        return Outcome.PUSH
+    return Outcome.LOSES
@@ -1,47 +1,116 @@
+from __future__ import annotations
 from shoe import Shoe
-from player import Player, HumanStrategy, BasicStrategy, CardCountingPlayer
+from player import Player, Players, HumanStrategy, BasicStrategy, CardCountingPlayer
 from round import Round
+from sim_round import SimRound
+from stats import TrueCountStats
+from audit import DecisionAudit
+from collections.abc import Iterator
+import random
+
+
+class RoundResult:
+    """Compact record of one round. Tuples are in seat order of everyone who started the session
+    (a removed player just shows their final bankroll and a net of 0)."""
+    __slots__ = ("round_number", "true_count", "bankrolls", "nets")
+
+    def __init__(self, round_number: int, true_count: int, bankrolls: tuple[int, ...], nets: tuple[int, ...]):
+        self.round_number = round_number
+        self.true_count = true_count # At bet time.
+        self.bankrolls = bankrolls
+        self.nets = nets
+
+    def __repr__(self):
+        return f"RoundResult({self.round_number}, tc={self.true_count}, bankrolls={self.bankrolls}, nets={self.nets})"
+
+
+def seeded_table(roster: list[list], shoe: dict, seed: int, shoe_class=Shoe) -> tuple[list[Player], Shoe]:
+    """Fresh players (from a roster spec, see Players.to_spec) and a shoe (from Shoe keyword arguments),
+    with everything random seeded from seed, counters included. Anything that needs "same config and
+    seed, same results" builds its table here."""
+    random.seed(seed) # Some strategies (e.g., RandomStrategy) use the global RNG.
+    players = Players.from_spec(roster)
+    shoe = shoe_class(**shoe, seed=seed)
+    for player in players:
+        if isinstance(player, CardCountingPlayer):
+            player.card_counter = shoe.card_counter
+    return players, shoe
 
 
 class Session:
     """Defines an collection of rounds (a game)."""
-    def __init__(self, players: list[Player], n_rounds: int=None):
+    def __init__(self, players: list[Player], n_rounds: int=None, tc_stats: TrueCountStats=None, shoe: Shoe=None,
+                 audit: DecisionAudit=None):
         self.players = players
-        self.shoe = Shoe()
+        self.shoe = shoe if shoe is not None else Shoe()
         self.round_number = 1
         self.n_rounds = n_rounds
         # If any player is human, we consider this session interactive (needs print statements)
         self.interactive = any(isinstance(p.strategy, HumanStrategy) for p in players)
+        self.round_engine = Round if self.interactive else SimRound # SimRound: same results, no printing.
         self.max_bankrolls = {player: player.bankroll for player in self.players}
+        self.tc_stats = tc_stats # Opt-in per true count histograms (see stats.py)
+        self.metrics = None      # Opt-in live metrics (see metrics.py)
+        self.audit = audit       # Opt-in decision-outcome cube (see audit.py)
+
+
+    @classmethod
+    def from_config(cls, roster: list[list], shoe: dict, seed: int, n_rounds: int, tc_stats: bool=False) -> Session:
+        """Build a reproducible sim session from plain data (see seeded_table). Same config and seed, same results."""
+        players, seeded_shoe = seeded_table(roster, shoe, seed)
+        return cls(players, n_rounds, TrueCountStats() if tc_stats else None, shoe=seeded_shoe)
 
     
-    def play_session(self):
+    def play_session(self, print_results: bool=True):
+        """Play until the human quits/goes broke, or n_rounds are done (sim). Set print_results=False
+        when running headless (e.g., a distributed worker) and read bankroll_results() instead."""
+        for _ in self.iter_rounds():
+            pass
+
+        if print_results:
+            if not self.players and not self.interactive: print(f"No strategy made it {self.n_rounds} rounds!")
+            self.print_bankroll_results()
+
+
+    def iter_rounds(self) -> Iterator[RoundResult]:
+        """Lazily play the session, yielding a RoundResult after every round. Stop iterating whenever
+        you like (the session can be resumed later by iterating again)."""
         for player in self.players:
             if isinstance(player, CardCountingPlayer):
                 player.card_counter = self.shoe.card_counter
 
-        while True:
-            if not self.players:
-                if not self.interactive: print(f"No strategy made it {self.n_rounds} rounds!")
+        seats = tuple(self.max_bankrolls) # Everyone who started, so results line up even after removals.
+        bankrolls = tuple(player.bankroll for player in seats)
 
-                self.print_bankroll_results()
-                break
-            result = Round(self.players, self.shoe, self.round_number, self.interactive).play_round()
+        while self.players and (self.interactive or self.round_number <= self.n_rounds):
+            true_count = self.shoe.card_counter.true_count
+            result = self.round_engine(self.players, self.shoe, self.round_number, self.interactive,
+                                       self.tc_stats, self.audit).play_round()
             self.update_max_bankrolls()
             if result == "stop_session":
                 # print("Debug: Human player is out of bankroll. Ending session.")
+                return
+
+            new_bankrolls = tuple(player.bankroll for player in seats)
+            record = RoundResult(self.round_number, true_count, new_bankrolls,
+                                 tuple(new - old for new, old in zip(new_bankrolls, bankrolls)))
+            bankrolls = new_bankrolls
+            if self.metrics is not None: self.metrics.record_round(true_count)
+            self.round_number += 1 # Before yielding, so a consumer that stops here can resume cleanly.
+            yield record
+
+
+    def iter_chunks(self, size: int) -> Iterator[list[RoundResult]]:
+        """Like iter_rounds, but yields lists of up to `size` results (e.g., for batched writers)."""
+        chunk = []
+        for result in self.iter_rounds():
+            chunk.append(result)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
 
-                self.print_bankroll_results()
-                break
-            self.round_number += 1
-            if not self.interactive and self.round_number > self.n_rounds:
-                
-                self.print_bankroll_results()
-                break
-        
-        # TODO
-        # print results here, especially for sim, but I guess even if player is out of bankroll too
-        # also need to keep track of game stats    
 
     def update_max_bankrolls(self) -> None:
         for player in self.max_bankrolls:
@@ -49,6 +118,14 @@ class Session:
                 self.max_bankrolls[player] = player.bankroll
 
 
+    def bankroll_results(self) -> list[dict]:
+        """Plain (JSON friendly) summary of every player who started the session."""
+        return [{"name": player.name,
+                 "bankroll": player.bankroll,
+                 "initial_bankroll": player.initial_bankroll,
+                 "max_bankroll": max_bankroll} for player, max_bankroll in self.max_bankrolls.items()]
+
+
     def print_bankroll_results(self) -> None:
             print("\n", "=" * 30, sep="")
             print("\nBANKROLL RESULTS:")
@@ -72,4 +149,13 @@ class Session:
                 print(f"{player.name}'s max bankroll: ${max_bankroll}")
                 print(f"Max bankroll growth: {disp_max_g}% Initial bankroll: ${player.initial_bankroll}")
                 print(f"Net bankroll growth: {disp_net_g}%")
+                for side_bet in player.side_bets:
+                    side_net = side_bet.returned - side_bet.wagered
+                    side_edge = 100 * side_net / side_bet.wagered if side_bet.wagered else 0.0
+                    print(f"{side_bet.name}: {side_bet.placed} bets, {side_bet.wins} wins, net ${side_net} ({side_edge:.2f}% of wagers)")
             print("")
+
+            if self.tc_stats is not None:
+                self.tc_stats.print_summary()
+            if self.audit is not None:
+                self.audit.print_summary()
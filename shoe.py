@@ -1,15 +1,30 @@
-from deck import Deck, Card
+from deck import Card, CARDS_BY_CODE, HILO_BY_CODE
 from counter import CardCounter
+from corpus import ShoeCorpus
 import random
 
 class Shoe:
-    def __init__(self, deck_count: int=6, penetration: float=0.75, use_csm: bool=False):
+    def __init__(self, deck_count: int=6, penetration: float=0.75, use_csm: bool=False, seed: int=None,
+                 corpus_path: str=None, corpus_start: int=0, corpus_step: int=1):
         self.deck_count = deck_count
         self.penetration = penetration  # Most casinos reshuffle the shoe when 75% of the cards have been used (4/6 decks).
         self.use_csm = use_csm
+        self.seed = seed
+        self.rng = random.Random(seed)  # Own RNG, so a seeded shoe deals the same cards no matter what else uses random.
+
+        # Optionally deal pre-shuffled shoes from a corpus file (see corpus.py) instead of shuffling.
+        self.corpus = None
+        if corpus_path is not None:
+            if use_csm: raise ValueError("A CSM shuffles discards back in, so it can't deal from a corpus.")
+            self.corpus = ShoeCorpus(corpus_path, corpus_start, corpus_step)
+            if self.corpus.deck_count != deck_count:
+                raise ValueError(f"{corpus_path} has {self.corpus.deck_count}-deck shoes, not {deck_count}.")
+
         self.cards = []
         self.discards = []
         self.card_counter = CardCounter()
+        self.table_state = None # TableRound's arrays (see table_state.py), made on first use.
+        self.reshuffles = -1 # build_shoe counts up, and the first build isn't a reshuffle.
         self.build_shoe()
 
     @property
@@ -22,17 +37,21 @@ class Shoe:
 
     def build_shoe(self):
         # print("Debug: Building Shoe")
-        self.cards.clear()
         self.discards.clear()
         self.card_counter.reset_counts()
+        self.reshuffles += 1
 
-        for _ in range(self.deck_count):
-            self.cards.extend(Deck().cards)
+        if self.corpus is not None:
+            self.cards = self.corpus.next_order() # Already shuffled, just move to the next shoe.
+            return
+
+        # Cards are never mutated, so every deck can share the same 52 Card objects (same order as Deck().cards).
+        self.cards = CARDS_BY_CODE * self.deck_count
         self.shuffle()
     
     def shuffle(self):
-        print("Debug: Shuffling the shoe.")
-        random.shuffle(self.cards)
+        # print("Debug: Shuffling the shoe.")
+        self.rng.shuffle(self.cards)
 
 
     def deal_card(self, update_count: bool=True) -> Card:
@@ -54,6 +73,49 @@ class Shoe:
         self.discards.append(card) # Technichally don't need if not use_csm, but might as well for analysis...
         return card
 
+    def composition(self) -> list[int]:
+        """How many of each card (by Card.code) are left in the shoe."""
+        counts = [0] * 52
+        for card in self.cards:
+            counts[card.code] += 1
+        return counts
+
+
+    def take(self, n: int):
+        """Take n counted cards off the shoe in as few slices as possible, reshuffling at the cut card
+        exactly like deal_card would. Yields each slice in deal order, count already updated."""
+        while n > 0:
+            if not self.use_csm and len(self.cards) < self.cut_card_position:
+                self.build_shoe()
+            # deal_card reshuffles once fewer than cut_card_position cards are left, so this many can go in one go.
+            available = len(self.cards) if self.use_csm else len(self.cards) - self.cut_card_position + 1
+            if available <= 0: raise IndexError("pop from empty shoe") # Only a CSM shoe can run dry.
+            k = min(n, available)
+            if isinstance(self.cards, list):
+                taken = self.cards[-k:]
+                del self.cards[-k:]
+            else:
+                taken = self.cards.take(k)
+            taken.reverse() # Cards come off the end.
+            self.card_counter.update_counts_bulk(sum(HILO_BY_CODE[card.code] for card in taken), self.decks_remaining())
+            self.discards.extend(taken) # Like deal_card, CSM or not.
+            n -= k
+            yield taken
+
+    def burn(self, n: int) -> None:
+        """Deal n cards to nobody (e.g., other players at a table we're only watching), counting all of them.
+        Reshuffles at the cut card exactly like deal_card would, but updates the count once per chunk."""
+        for _ in self.take(n):
+            pass
+
+    def deal_cards(self, n: int) -> list[Card]:
+        """n counted cards, in the order n deal_card() calls would deal them (and with the same count
+        afterwards, since the true count only depends on the running count and what's left)."""
+        dealt = []
+        for taken in self.take(n):
+            dealt += taken
+        return dealt
+
     def csm_recycle(self):
         """Use the CSM to recycle discards back into the shoe."""
         if self.use_csm and self.discards:
@@ -63,7 +125,7 @@ class Shoe:
             # Using empty slice so no cards are removed from shoe
 
             # print("DEBUG: Using CSM.")
-            random.shuffle(self.discards)
-            insertion_point = random.randint(0, len(self.cards))
+            self.rng.shuffle(self.discards)
+            insertion_point = self.rng.randint(0, len(self.cards))
             self.cards[insertion_point:insertion_point] = self.discards
             self.discards.clear()
@@ -0,0 +1,198 @@
+"""Optional side bets: Perfect Pairs and 21+3.
+
+Both are settled from the player's first two cards (plus the dealer upcard, for 21+3) with a single
+lookup into a payout table indexed by packed card codes (see Card.code). Both can also work out their
+exact EV from what's left in the shoe, which is what a counter would use to decide when to play them.
+
+Payouts are "to 1" (i.e., a win returns the bet plus payout * bet). A payout of 0 loses the bet.
+"""
+
+from abc import ABC, abstractmethod
+
+from deck import Deck
+
+RED_SUITS = {0, 1}       # Indexes into Deck.suits: hearts, diamonds
+N_RANKS = len(Deck.ranks)
+N_SUITS = len(Deck.suits)
+
+
+def rank_of(code: int) -> int:
+    return code % N_RANKS
+
+
+def suit_of(code: int) -> int:
+    return code // N_RANKS
+
+
+# --- Perfect Pairs ---
+
+PP_MIXED = 6     # Same rank, different colour
+PP_COLORED = 12  # Same rank and colour, different suit
+PP_PERFECT = 25  # Identical cards
+
+
+def perfect_pairs_payout(c1: int, c2: int) -> int:
+    if rank_of(c1) != rank_of(c2):
+        return 0
+    if c1 == c2:
+        return PP_PERFECT
+    if (suit_of(c1) in RED_SUITS) == (suit_of(c2) in RED_SUITS):
+        return PP_COLORED
+    return PP_MIXED
+
+
+# --- 21+3 ---
+
+T_FLUSH = 5
+T_STRAIGHT = 10
+T_THREE_OF_A_KIND = 30
+T_STRAIGHT_FLUSH = 40
+T_SUITED_TRIPS = 100
+
+# Rank indexes are in Deck.ranks order (2 ... K, A), so straights are consecutive indexes, plus A-2-3.
+STRAIGHTS = {frozenset((i, i + 1, i + 2)) for i in range(N_RANKS - 2)} | {frozenset((N_RANKS - 1, 0, 1))}
+STRAIGHT_RANKS = [tuple(sorted(straight)) for straight in STRAIGHTS]
+
+
+def twenty_one_plus_three_rank_payout(r1: int, r2: int, r3: int, suited: bool) -> int:
+    """Payout for three ranks, given whether all three cards share a suit."""
+    if r1 == r2 == r3:
+        return T_SUITED_TRIPS if suited else T_THREE_OF_A_KIND
+    if frozenset((r1, r2, r3)) in STRAIGHTS:
+        return T_STRAIGHT_FLUSH if suited else T_STRAIGHT
+    return T_FLUSH if suited else 0
+
+
+def twenty_one_plus_three_payout(c1: int, c2: int, c3: int) -> int:
+    return twenty_one_plus_three_rank_payout(
+        rank_of(c1), rank_of(c2), rank_of(c3), suit_of(c1) == suit_of(c2) == suit_of(c3))
+
+
+# Precomputed payout tables. PP is indexed by c1 * 52 + c2, 21+3 by (c1 * 52 + c2) * 52 + c3.
+PERFECT_PAIRS_TABLE = bytes(perfect_pairs_payout(c1, c2) for c1 in range(52) for c2 in range(52))
+TWENTY_ONE_PLUS_THREE_TABLE = bytes(
+    twenty_one_plus_three_payout(c1, c2, c3) for c1 in range(52) for c2 in range(52) for c3 in range(52))
+
+
+# --- Side bet objects (what a Player actually carries) ---
+
+class SideBet(ABC):
+    """A side bet a player makes every round (or only when its EV is at least min_ev, if given).
+    Keeps running totals, so results can be reported at the end of a session."""
+    name = "Side Bet"
+
+    def __init__(self, amount: int, min_ev: float = None):
+        self.amount = amount
+        self.min_ev = min_ev
+        self.placed = 0
+        self.wins = 0
+        self.wagered = 0
+        self.returned = 0
+
+    @abstractmethod
+    def payout(self, player_cards: list, dealer_upcard) -> int:
+        pass
+
+    @abstractmethod
+    def ev(self, composition: list[int]) -> float:
+        """Exact EV per unit bet, drawing from a shoe with composition[code] cards of each code left."""
+        pass
+
+    def wager(self, player, ev: float = None) -> int:
+        """How much to bet this round (0 to sit it out). ev is this round's EV, needed if min_ev is set."""
+        if self.min_ev is not None and ev < self.min_ev:
+            return 0
+        return min(self.amount, player.bankroll)
+
+    def settle(self, wager: int, player_cards: list, dealer_upcard) -> int:
+        """Amount returned to the player (0 on a loss), and update running totals."""
+        payout = self.payout(player_cards, dealer_upcard)
+        returned = wager * (payout + 1) if payout else 0
+        self.placed += 1
+        self.wins += payout > 0
+        self.wagered += wager
+        self.returned += returned
+        return returned
+
+
+class PerfectPairs(SideBet):
+    name = "Perfect Pairs"
+
+    def payout(self, player_cards, dealer_upcard) -> int:
+        return PERFECT_PAIRS_TABLE[player_cards[0].code * 52 + player_cards[1].code]
+
+    def ev(self, composition) -> float:
+        n = sum(composition)
+        if n < 2: return -1.0
+        perfect = colored = mixed = 0
+        for rank in range(N_RANKS):
+            counts = [composition[suit * N_RANKS + rank] for suit in range(N_SUITS)]
+            perfect += sum(c * (c - 1) for c in counts)
+            colored += 2 * (counts[0] * counts[1] + counts[2] * counts[3])
+            mixed += 2 * (counts[0] + counts[1]) * (counts[2] + counts[3])
+        returned = perfect * (PP_PERFECT + 1) + colored * (PP_COLORED + 1) + mixed * (PP_MIXED + 1)
+        return returned / (n * (n - 1)) - 1
+
+
+class TwentyOnePlusThree(SideBet):
+    name = "21+3"
+
+    def payout(self, player_cards, dealer_upcard) -> int:
+        return TWENTY_ONE_PLUS_THREE_TABLE[(player_cards[0].code * 52 + player_cards[1].code) * 52 + dealer_upcard.code]
+
+    def ev(self, composition) -> float:
+        """Counts ordered three-card draws per hand class, straight from the rank/suit totals
+        (instead of walking every rank triple), so it's cheap enough to run every round."""
+        n = sum(composition)
+        if n < 3: return -1.0
+        by_suit = [composition[suit * N_RANKS:(suit + 1) * N_RANKS] for suit in range(N_SUITS)]
+        rank_totals = [sum(counts) for counts in zip(*by_suit)]
+        suited_trips = sum(c * (c - 1) * (c - 2) for c in composition)
+        trips = sum(t * (t - 1) * (t - 2) for t in rank_totals) - suited_trips
+        # Three different ranks can come out in 6 orders.
+        straight_flushes = 6 * sum(counts[a] * counts[b] * counts[c] for counts in by_suit for a, b, c in STRAIGHT_RANKS)
+        straights = 6 * sum(rank_totals[a] * rank_totals[b] * rank_totals[c] for a, b, c in STRAIGHT_RANKS) - straight_flushes
+        flushes = sum(t * (t - 1) * (t - 2) for t in map(sum, by_suit)) - straight_flushes - suited_trips
+        returned = (suited_trips * (T_SUITED_TRIPS + 1) + trips * (T_THREE_OF_A_KIND + 1)
+                    + straight_flushes * (T_STRAIGHT_FLUSH + 1) + straights * (T_STRAIGHT + 1)
+                    + flushes * (T_FLUSH + 1))
+        return returned / (n * (n - 1) * (n - 2)) - 1
+
+
+# Every side bet by name, for roster specs (see Players.to_spec).
+SIDE_BETS = {cls.__name__: cls for cls in (PerfectPairs, TwentyOnePlusThree)}
+
+
+# --- Used by the round engines ---
+
+def place_side_bets(players: list, shoe) -> None:
+    """Take side bets (after main bets, before the deal). Composition and EVs are only worked out if
+    someone needs them, and then once per kind of side bet, since every seat bets on the same shoe."""
+    composition = None
+    evs = {}
+    for player in players:
+        if not player.side_bets: continue
+        player.side_wagers = []
+        for side_bet in player.side_bets:
+            ev = None
+            if side_bet.min_ev is not None:
+                ev = evs.get(type(side_bet))
+                if ev is None:
+                    if composition is None: composition = shoe.composition()
+                    ev = evs[type(side_bet)] = side_bet.ev(composition)
+            wager = side_bet.wager(player, ev)
+            player.bankroll -= wager
+            player.side_wagers.append(wager)
+        player.side_net = -sum(player.side_wagers)
+
+
+def settle_side_bets(players: list, dealer_upcard) -> None:
+    """Settle side bets right after the initial deal, from each player's first two cards."""
+    for player in players:
+        if not player.side_bets: continue
+        cards = player.current_hand.cards
+        for side_bet, wager in zip(player.side_bets, player.side_wagers):
+            if wager:
+                returned = side_bet.settle(wager, cards, dealer_upcard)
+                player.bankroll += returned
+                player.side_net += returned
@@ -0,0 +1,244 @@
+from player import Player
+from hand import Hand
+from round import Round
+from actions import Action, Outcome
+from side_bets import place_side_bets, settle_side_bets
+import rules
+
+
+class SimRound(Round):
+    """Fast-path Round for rosters with no HumanStrategy seat (i.e., simulations).
+
+    Same rules and payouts as Round (both go through rules.py), and it deals cards in exactly
+    the same order, so for the same shoe the bankrolls come out identical. What it skips:
+    table prints (removal_check's included), the shallow copy in removal_check, rebuilding each
+    player's deque/list every round, and the dealer's draw when nobody has a live hand left.
+
+    When every strategy at the table is batchable, each seat's first decision comes from one
+    make_decisions call per strategy class instead of one make_decision call per seat. That's a hook
+    for strategies that can answer many seats at once; the built-in ones mostly just loop, so for
+    them it saves little."""
+
+    def removal_check(self) -> None:
+        """Remove players with no bankroll left. Walks backwards so we can delete in place."""
+        players = self.players
+        for i in range(len(players) - 1, -1, -1):
+            if players[i].bankroll <= 0:
+                del players[i]
+        return None
+
+
+    def play_round(self):
+        """The round, step by step. TableRound plays the same steps, with its own new_hands, deal,
+        pay_naturals, play_hands and settle_hands."""
+        self.removal_check()
+        players = self.players
+        shoe = self.shoe
+
+        if self.tc_stats is not None:
+            bet_true_count = shoe.card_counter.true_count
+            bankrolls_before = [player.bankroll for player in players]
+
+        initial_bets = self.take_bets()
+        place_side_bets(players, shoe)
+        self.deal()
+        dealer_hand = self.dealer_hand
+        dealer_upcard = dealer_hand.cards[0]
+        settle_side_bets(players, dealer_upcard)
+
+        dealer_total = dealer_hand.hand_total()
+        waiting = self.pay_naturals(dealer_total)
+
+        if self.audit is not None:
+            audit_starts = self.audit.starts(waiting, dealer_upcard)
+
+        live_hands = self.play_turns(waiting, dealer_upcard)
+
+        # --- Dealer's turn ---
+        # Count the dealer's hole card when revealed
+        shoe.card_counter.update_counts(dealer_hand.cards[1], shoe.decks_remaining())
+
+        if live_hands:
+            deal_card = shoe.deal_card
+            while rules.dealer_draws(dealer_total):
+                dealer_hand.add_card(deal_card())
+                dealer_total = dealer_hand.hand_total()
+
+        self.settle_hands(dealer_total, live_hands)
+
+        if self.audit is not None:
+            self.audit.record(audit_starts)
+
+        if self.tc_stats is not None:
+            self.record_tc_stats(bet_true_count, bankrolls_before, initial_bets)
+
+        # Recycle shoe if using CSM (usually not, as it is not prefered).
+        shoe.csm_recycle()
+
+
+    def new_hands(self) -> list[Hand]:
+        """A fresh Hand for every seat, in seat order."""
+        return [Hand() for _ in self.players]
+
+
+    def take_bets(self) -> list[int]:
+        """Every seat's bet, taken off their bankroll and put on a fresh hand. Returns the bets, in seat order."""
+        bets = []
+        for player, hand in zip(self.players, self.new_hands()):
+            hand.bet = player.make_bet()
+            player.bankroll -= hand.bet
+            if player.bankroll < 0: raise RuntimeError(f"{player.name} bet more than their bankroll.")
+            player.current_hand = hand
+            bets.append(hand.bet)
+        return bets
+
+
+    def deal(self) -> None:
+        """Two cards to every seat, then the dealer's upcard and hole card (same order as Round.deal_initial_hands)."""
+        deal_card = self.shoe.deal_card
+        for player in self.players:
+            player.final_hands.clear()
+            player.hands_collection.clear()
+            player.current_hand.add_card(deal_card())
+            player.current_hand.add_card(deal_card())
+
+        dealer_hand = Hand()
+        dealer_hand.add_card(deal_card())                   # Upcard - count it
+        dealer_hand.add_card(deal_card(update_count=False)) # Hole card - don't count it
+        self.dealer_hand = dealer_hand
+
+
+    def pay_naturals(self, dealer_total: int) -> list[Player]:
+        """Pay (or push) every natural. Returns the players who still have a turn to play."""
+        waiting = []
+        for player in self.players:
+            hand = player.current_hand
+            if hand.hand_total() == 21:
+                if dealer_total == 21:
+                    player.bankroll += hand.bet
+                    hand.outcome = Outcome.PUSH_BLACKJACK
+                else:
+                    player.bankroll += rules.blackjack_return(hand.bet)
+                    hand.outcome = Outcome.BLACKJACK
+                continue
+            player.hands_collection.append(hand)
+            waiting.append(player)
+        return waiting
+
+
+    def play_turns(self, waiting: list[Player], dealer_upcard) -> int:
+        """Every waiting player's turn, in seat order. Returns the number of hands left waiting on the dealer."""
+        live_hands = 0
+        if all(player.strategy.batchable for player in waiting):
+            # Safe to ask up front: a batchable decision doesn't depend on cards dealt to other seats.
+            for player, first_decision in zip(waiting, self.first_decisions(waiting, dealer_upcard)):
+                live_hands += self.play_hands(player, dealer_upcard, first_decision)
+        else:
+            for player in waiting:
+                live_hands += self.play_hands(player, dealer_upcard)
+        return live_hands
+
+
+    def settle_hands(self, dealer_total: int, live_hands: int) -> None:
+        """Settle and pay every hand still waiting on the dealer (busts were settled when they happened)."""
+        if not live_hands: return
+        for player in self.players:
+            for hand in player.final_hands:
+                if rules.is_live(hand):
+                    hand.outcome = rules.settle(hand.hand_total(), dealer_total)
+                    player.bankroll += hand.bet * rules.PAYOUT_MULTIPLIER[hand.outcome]
+
+
+    @staticmethod
+    def first_decisions(players: list[Player], dealer_upcard) -> list[Action]:
+        """Decision for each player's current hand, with one make_decisions call per strategy class."""
+        if not players: return []
+        strategy = players[0].strategy
+        if all(type(player.strategy) is type(strategy) for player in players):
+            return strategy.make_decisions(players, dealer_upcard)
+
+        decisions = [None] * len(players)
+        groups = {}
+        for i, player in enumerate(players):
+            groups.setdefault(type(player.strategy), []).append(i)
+        for indices in groups.values():
+            batch = players[indices[0]].strategy.make_decisions([players[i] for i in indices], dealer_upcard)
+            for i, decision in zip(indices, batch):
+                decisions[i] = decision
+        return decisions
+
+
+    def play_hands(self, player: Player, dealer_upcard, first_decision: Action | None = None) -> int:
+        """Play out all of a player's hands (including ones created by splits), in the same order
+        as Round.player_turns_with_split. Returns the number of hands left waiting on the dealer.
+        first_decision, if given, is used for the first decision on the player's initial hand."""
+        deal_card = self.shoe.deal_card
+        hands_collection = player.hands_collection
+        final_hands = player.final_hands
+        live = 0
+
+        while hands_collection:
+            hand = player.current_hand = hands_collection.popleft()
+
+            while True:
+                if hand.hand_total() == 21:
+                    decision = Action.STAND
+                elif first_decision is not None:
+                    decision, first_decision = first_decision, None
+                else:
+                    decision = player.make_decision(dealer_upcard)
+
+                if decision == Action.HIT:
+                    hand.add_card(deal_card())
+                    hand.actions.append(Action.HIT)
+                    if hand.hand_total() > 21:
+                        hand.outcome = Outcome.BUST
+                        final_hands.append(hand)
+                        break
+
+                elif decision == Action.STAND:
+                    hand.actions.append(Action.STAND)
+                    final_hands.append(hand)
+                    live += 1
+                    break
+
+                elif decision == Action.DOUBLE:
+                    if not player.can_double(): raise RuntimeError(f"{player.name} can't double.")
+                    player.bankroll -= hand.bet
+                    hand.bet *= 2
+                    hand.add_card(deal_card())
+                    hand.actions.append(Action.DOUBLE)
+                    if hand.hand_total() > 21:
+                        hand.outcome = Outcome.BUST
+                    else:
+                        hand.actions.append(Action.STAND) # After doubling, you MUST stand
+                        live += 1
+                    final_hands.append(hand)
+                    break
+
+                elif decision == Action.SPLIT:
+                    # Round re-asks forever on an invalid split, which would hang a bot. Fail loudly instead.
+                    if not player.can_split(): raise RuntimeError(f"{player.name} can't split {hand.cards}.")
+                    new_hand1 = Hand()
+                    new_hand1.bet = hand.bet
+                    new_hand2 = Hand()
+                    new_hand2.bet = hand.bet
+                    player.bankroll -= hand.bet
+
+                    new_hand1.add_card(hand.cards[0])
+                    new_hand2.add_card(hand.cards[1])
+                    new_hand1.add_card(deal_card())
+                    new_hand2.add_card(deal_card())
+
+                    # Put new hands to the front of the queue (ensures correct playing order)
+                    hands_collection.appendleft(new_hand2)
+                    hands_collection.appendleft(new_hand1)
+
+                    hand.actions.append(Action.SPLIT)
+                    final_hands.append(hand)
+                    break
+
+                else:
+                    raise RuntimeError(f"{player.name}'s strategy returned an invalid decision: {decision}")
+
+        return live
@@ -0,0 +1,104 @@
+from __future__ import annotations
+from array import array
+import math
+
+
+MIN_TC = -10 # True counts at or below this share the lowest bucket.
+MAX_TC = 10  # ... and at or above this share the highest.
+N_BUCKETS = MAX_TC - MIN_TC + 1
+
+
+class TrueCountStats:
+    """Opt-in collector that buckets every (player, round) by the true count at bet time.
+
+    Everything lives in fixed-size arrays (one slot per true count bucket), so memory is
+    the same for 100 rounds or 100 million. Collectors from separate runs can be merged,
+    which is what makes this usable across parallel runs. This is the data a bet ramp
+    for BasicStrategy.make_bet should be built on."""
+
+    FIELDS = ("rounds", "hands", "blackjacks", "doubles", "splits", "busts")
+
+    def __init__(self):
+        self.rounds = array("q", bytes(8 * N_BUCKETS))
+        self.hands = array("q", bytes(8 * N_BUCKETS))
+        self.blackjacks = array("q", bytes(8 * N_BUCKETS))
+        self.doubles = array("q", bytes(8 * N_BUCKETS))
+        self.splits = array("q", bytes(8 * N_BUCKETS))
+        self.busts = array("q", bytes(8 * N_BUCKETS))
+        self.units = array("d", bytes(8 * N_BUCKETS))    # Net units won (net / initial bet), summed.
+        self.units_sq = array("d", bytes(8 * N_BUCKETS)) # Sum of squares, for variance.
+
+
+    @staticmethod
+    def bucket(true_count: int) -> int:
+        """Index into the arrays for a true count (clamped to [MIN_TC, MAX_TC])."""
+        if true_count <= MIN_TC: return 0
+        if true_count >= MAX_TC: return N_BUCKETS - 1
+        return true_count - MIN_TC
+
+
+    def record(self, true_count: int, net: int, bet: int, hands: int,
+               blackjack: bool, doubles: int, splits: int, busts: int) -> None:
+        """Record one player's round."""
+        i = self.bucket(true_count)
+        units = net / bet
+        self.rounds[i] += 1
+        self.hands[i] += hands
+        self.blackjacks[i] += blackjack
+        self.doubles[i] += doubles
+        self.splits[i] += splits
+        self.busts[i] += busts
+        self.units[i] += units
+        self.units_sq[i] += units * units
+
+
+    def merge(self, other: TrueCountStats) -> TrueCountStats:
+        """Add another collector's totals into this one (e.g., from another process). Returns self."""
+        for field in self.FIELDS + ("units", "units_sq"):
+            mine, theirs = getattr(self, field), getattr(other, field)
+            for i in range(N_BUCKETS):
+                mine[i] += theirs[i]
+        return self
+
+
+    def to_dict(self) -> dict[str, list]:
+        """Plain lists, e.g., for sending over the wire as JSON."""
+        return {field: list(getattr(self, field)) for field in self.FIELDS + ("units", "units_sq")}
+
+
+    @classmethod
+    def from_dict(cls, d: dict[str, list]) -> TrueCountStats:
+        stats = cls()
+        for field in cls.FIELDS + ("units", "units_sq"):
+            getattr(stats, field)[:] = array(getattr(stats, field).typecode, d[field])
+        return stats
+
+
+    def edge(self, i: int) -> float:
+        """Mean units won per round in bucket i (i.e., the player's edge at that count)."""
+        return self.units[i] / self.rounds[i] if self.rounds[i] else 0.0
+
+
+    def variance(self, i: int) -> float:
+        """Variance of units won per round in bucket i."""
+        n = self.rounds[i]
+        if n < 2: return 0.0
+        mean = self.units[i] / n
+        return max(0.0, (self.units_sq[i] - n * mean * mean) / (n - 1))
+
+
+    def print_summary(self) -> None:
+        print("\n", "=" * 30, sep="")
+        print("\nTRUE COUNT RESULTS:")
+        print("\n", "=" * 30, sep="")
+        print("\nTC    | Rounds     | Edge (units) | Std Dev | BJ %  | Double % | Split % | Bust %")
+        print("------+------------+--------------+---------+-------+----------+---------+-------")
+        for i in range(N_BUCKETS):
+            n, hands = self.rounds[i], self.hands[i]
+            if not n: continue
+            tc = i + MIN_TC
+            tc_str = f"<={tc}" if i == 0 else f">={tc}" if i == N_BUCKETS - 1 else str(tc)
+            print(f"{tc_str:<5} | {n:>10} | {self.edge(i):>+12.4f} | {math.sqrt(self.variance(i)):>7.3f} | "
+                  f"{100 * self.blackjacks[i] / n:>5.2f} | {100 * self.doubles[i] / hands:>8.2f} | "
+                  f"{100 * self.splits[i] / n:>7.2f} | {100 * self.busts[i] / hands:>6.2f}")
+        print("")
@@ -0,0 +1,353 @@
+"""Struct-of-arrays table state: every hand at the table as a row of a few contiguous arrays.
+
+TableState keeps, for every hand in play this round (the dealer's included), its seat, bet, total,
+soft aces and status (playing, waiting on the dealer, bust, split, natural), plus one bankroll per
+seat. A hand's total is kept up to date as each card is dealt, from the card's code, so nothing
+re-sums Hand.cards: the hands are TableHands, whose hand_total() reads their row (for the engine's
+bust and 21 checks, the strategies' decisions and the dealer's draws alike). The naturals check is
+one comparison over the table, and settlement is one lookup per hand (rules.settle, precomputed for
+every dealer total and hand row) added onto the bankrolls (through a bincount when someone split).
+
+The arrays are array.array buffers, so updating one hand during play is plain Python indexing, with
+NumPy views over the same memory for the table-wide steps. A table's TableState hangs off its shoe
+(Shoe.table_state) and is reused round after round.
+
+TableRound plays SimRound's round (same steps, see SimRound.play_round) on a TableState. Strategies
+still get Player and Hand objects, so cards, actions and bets go on the Hands as usual, and bankrolls
+are gathered into the array and written back once per round, at settlement. Once a round is settled
+its hands let go of the arrays (hand_total() goes back to summing the cards), since the next round
+reuses the rows.
+
+Bankrolls come out identical to Round for the same shoe
+(check with `python golden.py replay golden.jsonl --engine table_state:TableRound`), and
+`python golden.py bench --engine table_state:TableRound --reference sim_round:SimRound --seats N`
+times it against SimRound.
+
+TableState() raises ImportError without NumPy; SimRound is the engine to use then.
+"""
+
+from __future__ import annotations
+from array import array
+from operator import attrgetter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from actions import Action, Outcome
+from deck import CARDS_BY_CODE
+from hand import Hand
+from sim_round import SimRound
+import rules
+
+
+# Hand status. Settlement looks a hand up by (dealer total, status * ROW + total).
+PLAYING, LIVE, BUST, SPLIT, NATURAL, NATURAL_PUSH = range(6)
+ROW = 32   # More than any hand total (a bust is at most 30).
+DEALER = 0 # The dealer's slot. Seat i's first hand is slot i + 1, split hands come after those.
+
+VALUE_BY_CODE = [card.value for card in CARDS_BY_CODE] # Aces are 11, and come down to 1 as needed.
+ACES_BY_CODE = [int(card.rank == "A") for card in CARDS_BY_CODE]
+# Total and soft aces of a two-card hand, indexed by code1 * 52 + code2 (two aces make a soft 12).
+TOTAL_BY_CODES = [v1 + v2 - 10 * (a1 and a2) for v1, a1 in zip(VALUE_BY_CODE, ACES_BY_CODE)
+                  for v2, a2 in zip(VALUE_BY_CODE, ACES_BY_CODE)]
+SOFT_BY_CODES = [a1 + a2 - (a1 and a2) for a1 in ACES_BY_CODE for a2 in ACES_BY_CODE]
+
+OUTCOMES = list(Outcome) + [None] # Settled outcome codes back to Outcome (-1 is a split hand, which has none).
+CODE = attrgetter("code")
+BANKROLL = attrgetter("bankroll")
+
+
+def settle_row(status: int, total: int, dealer_total: int) -> tuple[int, int]:
+    """(Amount returned per unit bet, doubled so that 3:2 is a whole number, and Outcome code) for one
+    hand row, like SimRound settles it."""
+    if status == LIVE and total <= 21:
+        outcome = rules.settle(total, dealer_total)
+        return 2 * rules.PAYOUT_MULTIPLIER[outcome], outcome
+    if status == NATURAL:
+        return int(2 * rules.BLACKJACK_PAYS), Outcome.BLACKJACK # Halved (rounding down) per seat, like rules.blackjack_return.
+    if status == NATURAL_PUSH:
+        return 2 * rules.PAYOUT_MULTIPLIER[Outcome.PUSH_BLACKJACK], Outcome.PUSH_BLACKJACK
+    if status == BUST:
+        return 0, Outcome.BUST
+    return 0, -1 # Split (replaced by its two hands), or never finished.
+
+
+if np is not None:
+    TOTAL_ARRAY = np.array(TOTAL_BY_CODES, dtype=np.int16)
+    SOFT_ARRAY = np.array(SOFT_BY_CODES, dtype=np.int8)
+    SETTLE_ROWS = [[settle_row(status, total, dealer_total) for status in range(6) for total in range(ROW)]
+                   for dealer_total in range(ROW)]
+    DOUBLE_RETURN_BY_ROW = np.array([[r for r, _ in row] for row in SETTLE_ROWS], dtype=np.int64)
+    OUTCOME_BY_ROW = np.array([[o for _, o in row] for row in SETTLE_ROWS], dtype=np.int64)
+
+
+class TableHand(Hand):
+    """A Hand whose total lives in a TableState row while its round is in play."""
+    __slots__ = ("state", "slot")
+
+    def __init__(self, state: TableState, slot: int):
+        self.cards = [] # Hand.__init__, inlined (there's one of these per hand).
+        self.actions = array("B")
+        self.outcome = None
+        self.state = state
+        self.slot = slot
+
+    def hand_total(self) -> int:
+        state = self.state
+        return Hand.hand_total(self) if state is None else state.total[self.slot]
+
+    def add_card(self, card) -> None:
+        self.cards.append(card)
+        if self.state is not None:
+            self.state.add_card(self.slot, card.code)
+
+
+class TableState:
+    """Arrays for one table. Hand arrays are indexed by slot (see DEALER), seat arrays by position in
+    the round's player list. hands holds the TableHand of every slot in play."""
+
+    def __init__(self, seats: int = 7):
+        if np is None:
+            raise ImportError("TableState needs NumPy (pip install numpy).")
+        self.n_seats = 0
+        self.hands = []
+        self.capacity = 0
+        self.seat = array("q")   # Seat the hand belongs to (-1 for the dealer).
+        self.bet = array("q")    # Current bet (doubles included).
+        self.total = array("h")  # Best total, like Hand.hand_total.
+        self.soft = array("b")   # Aces still counted as 11.
+        self.status = array("h") # PLAYING, LIVE, ...
+        self.bankroll = np.zeros(0, dtype=np.int64)
+        self.allocate(seats, 1 + seats * rules.MAX_HANDS)
+
+
+    def __reduce__(self):
+        # The NumPy views would unpickle as copies of the buffers, so only the size survives a pickle.
+        return TableState, (len(self.bankroll),)
+
+
+    def allocate(self, seats: int, hands: int) -> None:
+        """Grow to at least this many seats and hands, keeping the hands in play."""
+        if seats > len(self.bankroll):
+            self.bankroll = np.zeros(seats, dtype=np.int64)
+        if hands <= self.capacity: return
+        self.views = None # Release the buffers, so they can be resized.
+        for buffer in (self.seat, self.bet, self.total, self.soft, self.status):
+            buffer.frombytes(bytes(buffer.itemsize * (hands - self.capacity)))
+        self.capacity = hands
+        self.views = [np.frombuffer(buffer, dtype=dtype) for buffer, dtype in (
+            (self.seat, np.int64), (self.bet, np.int64), (self.total, np.int16), (self.soft, np.int8), (self.status, np.int16))]
+
+
+    def new_round(self, n_seats: int) -> list[TableHand]:
+        """Empty the table for n_seats seats. Returns the dealer's hand, then one fresh hand per seat."""
+        if n_seats != self.n_seats: # The first hands' seats only change with the number of seats.
+            self.allocate(n_seats, 1 + n_seats * rules.MAX_HANDS)
+            self.n_seats = n_seats
+            self.seat[DEALER] = -1
+            self.seat[1:n_seats + 1] = array("q", range(n_seats))
+        self.hands = [TableHand(self, slot) for slot in range(n_seats + 1)]
+        return self.hands
+
+
+    def deal(self, bets: list[int], codes: list[int]) -> list[bool]:
+        """Load the initial deal: this round's bets, and the codes of the dealer's two cards followed by every
+        seat's two, in slot order. Returns which seats were dealt a natural."""
+        n = self.n_seats
+        _, bet, total, soft, status = self.views
+        bet[1:n + 1] = bets
+        pairs = np.array(codes, dtype=np.int64)
+        pairs = pairs[0::2] * 52 + pairs[1::2]
+        total[:n + 1] = TOTAL_ARRAY[pairs]
+        soft[:n + 1] = SOFT_ARRAY[pairs]
+        status[:n + 1] = PLAYING
+        return (total[1:n + 1] == 21).tolist()
+
+
+    def add_card(self, slot: int, code: int) -> None:
+        """Add a card to a hand's total."""
+        total = self.total[slot] + VALUE_BY_CODE[code]
+        soft = self.soft[slot] + ACES_BY_CODE[code]
+        while total > 21 and soft:
+            total -= 10
+            soft -= 1
+        self.total[slot] = total
+        self.soft[slot] = soft
+
+
+    def split_hand(self, seat: int, bet: int) -> TableHand:
+        """A new, empty hand for seat (one half of a split)."""
+        slot = len(self.hands)
+        if slot == self.capacity:
+            self.allocate(self.n_seats, 2 * self.capacity)
+        self.seat[slot] = seat
+        self.bet[slot] = bet
+        self.total[slot] = self.soft[slot] = 0
+        self.status[slot] = PLAYING
+        hand = TableHand(self, slot)
+        hand.bet = bet
+        self.hands.append(hand)
+        return hand
+
+
+    def settle(self, bankrolls: list[int]) -> list[int]:
+        """Settle every seat's hands against the dealer's final total, and pay them. bankrolls are the
+        players' bankrolls before settlement; returns them after. Every hand gets its outcome, and lets
+        go of its row."""
+        n, m = self.n_seats, len(self.hands)
+        seat, bet, total, soft, status = self.views
+        rows = status[1:m] * ROW
+        rows += total[1:m]
+        paid = bet[1:m] * DOUBLE_RETURN_BY_ROW[self.total[DEALER]].take(rows)
+        if m > n + 1: # Someone split, so add up each seat's hands (a natural is always alone, so still one odd amount at most).
+            paid = np.bincount(seat[1:m], weights=paid, minlength=n).astype(np.int64)
+        paid >>= 1
+        bankroll = np.add(paid, bankrolls, out=self.bankroll[:n])
+
+        hands = self.hands
+        hands[DEALER].state = None
+        for hand, outcome in zip(hands[1:], OUTCOME_BY_ROW[self.total[DEALER]].take(rows).tolist()):
+            hand.state = None
+            if outcome >= 0:
+                hand.outcome = OUTCOMES[outcome]
+        self.hands = []
+        return bankroll.tolist()
+
+
+class TableRound(SimRound):
+    """SimRound on a TableState. Same cards, same decisions, same bankrolls; hand totals, busts, naturals
+    and settlement come from the arrays."""
+
+    def new_hands(self) -> list[TableHand]:
+        shoe = self.shoe
+        if shoe.table_state is None:
+            shoe.table_state = TableState(len(self.players))
+        self.state = shoe.table_state
+        return self.state.new_round(len(self.players))[1:]
+
+
+    def take_bets(self) -> list[int]:
+        self.bets = super().take_bets()
+        return self.bets
+
+
+    def deal(self) -> None:
+        """Same cards as SimRound.deal, off the shoe in one go (the hole card is the only one not counted)."""
+        players = self.players
+        shoe = self.shoe
+        cards = shoe.deal_cards(2 * len(players) + 1)
+        for i, player in enumerate(players):
+            player.final_hands.clear()
+            player.hands_collection.clear()
+            player.current_hand.cards += cards[2 * i:2 * i + 2]
+
+        dealer_hand = self.dealer_hand = self.state.hands[DEALER]
+        dealer_hand.cards += (cards[-1], shoe.deal_card(update_count=False))
+        self.naturals = self.state.deal(self.bets, [card.code for card in dealer_hand.cards] + [card.code for card in cards[:-1]])
+
+
+    def pay_naturals(self, dealer_total: int) -> list:
+        """Mark every natural (they're paid in settle_hands, with everything else). Returns the players
+        who still have a turn to play."""
+        status = self.state.status
+        natural, outcome = (NATURAL_PUSH, Outcome.PUSH_BLACKJACK) if dealer_total == 21 else (NATURAL, Outcome.BLACKJACK)
+        waiting = []
+        for player, dealt_natural in zip(self.players, self.naturals):
+            hand = player.current_hand
+            if dealt_natural:
+                status[hand.slot] = natural
+                hand.outcome = outcome
+            else:
+                player.hands_collection.append(hand)
+                waiting.append(player)
+        return waiting
+
+
+    def play_hands(self, player, dealer_upcard, first_decision: Action | None = None) -> int:
+        """SimRound.play_hands, with each hand's status and bet kept in its row of the TableState
+        (its total keeps itself up to date, see TableHand)."""
+        state = self.state
+        totals, statuses, bets = state.total, state.status, state.bet
+        deal_card = self.shoe.deal_card
+        hands_collection = player.hands_collection
+        final_hands = player.final_hands
+        live = 0
+
+        while hands_collection:
+            hand = player.current_hand = hands_collection.popleft()
+            slot = hand.slot
+
+            while True:
+                if totals[slot] == 21:
+                    decision = Action.STAND
+                elif first_decision is not None:
+                    decision, first_decision = first_decision, None
+                else:
+                    decision = player.make_decision(dealer_upcard)
+
+                if decision == Action.HIT:
+                    hand.add_card(deal_card())
+                    hand.actions.append(Action.HIT)
+                    if totals[slot] > 21:
+                        statuses[slot] = BUST
+                        hand.outcome = Outcome.BUST
+                        final_hands.append(hand)
+                        break
+
+                elif decision == Action.STAND:
+                    hand.actions.append(Action.STAND)
+                    statuses[slot] = LIVE
+                    final_hands.append(hand)
+                    live += 1
+                    break
+
+                elif decision == Action.DOUBLE:
+                    if not player.can_double(): raise RuntimeError(f"{player.name} can't double.")
+                    player.bankroll -= hand.bet
+                    hand.bet *= 2
+                    bets[slot] = hand.bet
+                    hand.add_card(deal_card())
+                    hand.actions.append(Action.DOUBLE)
+                    if totals[slot] > 21:
+                        statuses[slot] = BUST
+                        hand.outcome = Outcome.BUST
+                    else:
+                        hand.actions.append(Action.STAND) # After doubling, you MUST stand
+                        statuses[slot] = LIVE
+                        live += 1
+                    final_hands.append(hand)
+                    break
+
+                elif decision == Action.SPLIT:
+                    if not player.can_split(): raise RuntimeError(f"{player.name} can't split {hand.cards}.")
+                    seat = state.seat[slot]
+                    new_hand1 = state.split_hand(seat, hand.bet)
+                    new_hand2 = state.split_hand(seat, hand.bet)
+                    player.bankroll -= hand.bet
+
+                    new_hand1.add_card(hand.cards[0])
+                    new_hand2.add_card(hand.cards[1])
+                    new_hand1.add_card(deal_card())
+                    new_hand2.add_card(deal_card())
+
+                    hands_collection.appendleft(new_hand2)
+                    hands_collection.appendleft(new_hand1)
+
+                    hand.actions.append(Action.SPLIT)
+                    statuses[slot] = SPLIT
+                    final_hands.append(hand)
+                    break
+
+                else:
+                    raise RuntimeError(f"{player.name}'s strategy returned an invalid decision: {decision}")
+
+        return live
+
+
+    def settle_hands(self, dealer_total: int, live_hands: int) -> None:
+        """Settle every hand and pay every seat (naturals included) off the arrays."""
+        players = self.players
+        for player, bankroll in zip(players, self.state.settle(list(map(BANKROLL, players)))):
+            player.bankroll = bankroll
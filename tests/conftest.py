@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The lab is a flat set of modules that load tables/*.csv by relative path, so run from the repo root.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
@@ -0,0 +1,117 @@
+import contextlib
+import io
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import audit
+from actions import Action, Outcome
+from audit import DEALER_KEYS, STATE_INDEX, DecisionAudit
+from deck import Card
+from golden import DEFAULT_ROSTER
+from hand import Hand
+from player import CHARTS, BasicStrategy, Player
+from round import Round
+from rules import DEFAULT_SHOE
+from session import seeded_table
+from sim_round import SimRound
+
+
+def seat(*ranks) -> Player:
+    """A player dealt ranks, with a bet of 10 and their turn still to play."""
+    player = Player("p", BasicStrategy(), 1000)
+    player.current_hand = Hand()
+    player.current_hand.bet = 10
+    player.current_hand.cards = [Card(rank, "♥") for rank in ranks]
+    player.hands_collection.append(player.current_hand)
+    return player
+
+
+def finish(bet: int, actions: list[Action], outcome: Outcome | None) -> Hand:
+    hand = Hand()
+    hand.bet, hand.actions, hand.outcome = bet, actions, outcome
+    return hand
+
+
+def cell(chart: str, row: str, upcard: str, action: Action) -> tuple:
+    return STATE_INDEX[chart, row], DEALER_KEYS.index(upcard), action
+
+
+def hand_built_round(cube: DecisionAudit, upcard: str) -> None:
+    split, double, natural = seat("8", "8"), seat("5", "6"), seat("A", "K")
+    natural.hands_collection.clear() # Paid before anyone played, so it has no decision to record.
+    starts = cube.starts([split, double, natural], Card(upcard, "♠"))
+    assert len(starts) == 2
+
+    # 8,8 split: one half wins its 10, the other doubles to 20 and loses. Net -10 on a 10 bet.
+    eights = split.current_hand
+    eights.actions.append(Action.SPLIT)
+    split.final_hands = [eights, finish(10, [Action.STAND], Outcome.WINS),
+                         finish(20, [Action.DOUBLE, Action.STAND], Outcome.LOSES)]
+    # 5,6 doubled into a bust: -2 units.
+    eleven = double.current_hand
+    eleven.bet *= 2
+    eleven.actions.append(Action.DOUBLE)
+    eleven.outcome = Outcome.BUST
+    double.final_hands = [eleven]
+    cube.record(starts)
+
+
+def test_hand_built_rounds_land_in_their_cells():
+    cube = DecisionAudit()
+    hand_built_round(cube, "6")
+    counts, units, units_sq = cube.cube("counts"), cube.cube("units"), cube.cube("units_sq")
+    assert counts.sum() == 2
+    assert counts[cell("pair", "88", "6", Action.SPLIT)] == 1
+    assert units[cell("pair", "88", "6", Action.SPLIT)] == -1.0
+    assert counts[cell("hard", "11", "6", Action.DOUBLE)] == 1
+    assert units[cell("hard", "11", "6", Action.DOUBLE)] == -2.0
+    assert units_sq[cell("hard", "11", "6", Action.DOUBLE)] == 4.0
+
+    heat = cube.heatmap("pair")
+    assert heat["rows"] == list(CHARTS["pair"])
+    assert heat["counts"][heat["rows"].index("88"), DEALER_KEYS.index("6"), Action.SPLIT] == 1
+    assert heat["ev"][heat["rows"].index("88"), DEALER_KEYS.index("6"), Action.SPLIT] == -1.0
+    assert cube.heatmap("hard")["counts"].sum() == 1
+
+
+def test_records_are_buffered_until_flush(monkeypatch):
+    monkeypatch.setattr(audit, "FLUSH_EVERY", 4)
+    cube = DecisionAudit()
+    hand_built_round(cube, "6")
+    assert cube.counts.sum() == 0 and len(cube.pending_index) == 2
+    hand_built_round(cube, "10")
+    assert cube.counts.sum() == 4 and not cube.pending_index
+
+
+def play(engine, seed: int, cube: DecisionAudit, n_rounds: int = 400) -> None:
+    players, shoe = seeded_table(DEFAULT_ROSTER, DEFAULT_SHOE, seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for round_number in range(1, n_rounds + 1):
+            if not players: break
+            engine(players, shoe, round_number, False, None, cube).play_round()
+
+
+def test_merge_is_one_audit_over_both_sessions():
+    together = DecisionAudit()
+    first, second = DecisionAudit(), DecisionAudit()
+    for seed, cube in ((0, first), (1, second)):
+        play(SimRound, seed, cube)
+        play(SimRound, seed, together)
+    assert first.merge(second).to_dict() == together.to_dict()
+
+
+def test_dict_round_trip():
+    cube = DecisionAudit()
+    play(SimRound, 2, cube)
+    assert DecisionAudit.from_dict(cube.to_dict()).to_dict() == cube.to_dict()
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_round_and_sim_round_fill_the_same_cube(seed):
+    reference, fast = DecisionAudit(), DecisionAudit()
+    play(Round, seed, reference)
+    play(SimRound, seed, fast)
+    assert reference.to_dict() == fast.to_dict()
+    assert sum(reference.to_dict()["counts"]) > 0
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from cache import ResultCache
+from rules import DEFAULT_SHOE
+from session import Session
+
+ROSTER = [
+    ["Player", "Random", "RandomStrategy", 100000],
+    ["CardCountingPlayer", "Index", "IndexStrategy", 100000]]
+N_ROUNDS = 20 # Short, so the Random seat (which bets 10-25% of its bankroll) is still drawing at 2 * N_ROUNDS.
+
+
+@pytest.fixture
+def results_cache(tmp_path):
+    results_cache = ResultCache(str(tmp_path / "results.sqlite"))
+    yield results_cache
+    results_cache.close()
+
+
+def test_extending_a_cached_run_is_a_fresh_run(tmp_path, results_cache, monkeypatch):
+    results_cache.run(ROSTER, DEFAULT_SHOE, 4, N_ROUNDS, tc_stats=True)
+    random.random() # Whatever ran in between, the checkpoint brings the global RNG back.
+
+    resumed = []
+    longest_prefix = ResultCache.longest_prefix
+    def spy(self, *args):
+        resumed.append(longest_prefix(self, *args))
+        return resumed[-1]
+    monkeypatch.setattr(ResultCache, "longest_prefix", spy)
+    extended = results_cache.run(ROSTER, DEFAULT_SHOE, 4, 2 * N_ROUNDS, tc_stats=True)
+    assert resumed[0] is not None
+
+    fresh_cache = ResultCache(str(tmp_path / "fresh.sqlite"))
+    fresh = fresh_cache.run(ROSTER, DEFAULT_SHOE, 4, 2 * N_ROUNDS, tc_stats=True)
+    fresh_cache.close()
+    assert extended == fresh
+    assert extended["rounds_played"] == 2 * N_ROUNDS
+    assert extended["players"][0]["bankroll"] > 0
+
+
+def test_exact_hit_is_not_replayed(results_cache, monkeypatch):
+    first = results_cache.run(ROSTER, DEFAULT_SHOE, 5, N_ROUNDS)
+    def no_replay(*args, **kwargs):
+        raise AssertionError("played a cached run again")
+    monkeypatch.setattr(Session, "play_session", no_replay)
+    assert results_cache.run(ROSTER, DEFAULT_SHOE, 5, N_ROUNDS) == first
+
+
+def test_evict_takes_the_players_with_the_runs(results_cache):
+    for seed in range(3):
+        results_cache.run(ROSTER, DEFAULT_SHOE, seed, 50)
+    assert results_cache.evict(1) == 2
+    runs = results_cache.db.execute("SELECT id FROM runs").fetchall()
+    players = results_cache.db.execute("SELECT DISTINCT run_id FROM run_players").fetchall()
+    assert len(runs) == 1
+    assert players == runs
+    assert results_cache.db.execute("SELECT COUNT(*) FROM run_players").fetchone()[0] == len(ROSTER)
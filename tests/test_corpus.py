@@ -0,0 +1,62 @@
+import pytest
+
+from corpus import MAGIC, ShoeCorpus, generate_corpus
+from shoe import Shoe
+
+
+@pytest.fixture
+def corpus_path(tmp_path):
+    path = str(tmp_path / "shoes.bin")
+    generate_corpus(path, 6, deck_count=1, seed=11)
+    return path
+
+
+def test_same_seed_same_file(tmp_path, corpus_path):
+    again = tmp_path / "again.bin"
+    generate_corpus(str(again), 6, deck_count=1, seed=11, chunk=4) # Chunking doesn't change the bytes.
+    assert again.read_bytes() == open(corpus_path, "rb").read()
+    other = tmp_path / "other.bin"
+    generate_corpus(str(other), 6, deck_count=1, seed=12)
+    assert other.read_bytes() != again.read_bytes()
+
+
+def test_truncated_corpus_is_rejected(tmp_path, corpus_path):
+    truncated = tmp_path / "truncated.bin"
+    truncated.write_bytes(open(corpus_path, "rb").read()[:-1])
+    with pytest.raises(ValueError, match="truncated"):
+        ShoeCorpus(str(truncated))
+
+
+def test_wrong_magic_is_rejected(tmp_path, corpus_path):
+    data = bytearray(open(corpus_path, "rb").read())
+    data[:len(MAGIC)] = b"NOTSHOE\n"
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="isn't a shoe corpus"):
+        ShoeCorpus(str(bad))
+
+
+def test_shoe_deals_the_stored_order_from_the_end(corpus_path):
+    corpus = ShoeCorpus(corpus_path)
+    shoe = Shoe(deck_count=1, corpus_path=corpus_path)
+    dealt = [shoe.deal_card().code for _ in range(20)]
+    assert dealt == list(reversed(corpus.order(0)))[:20]
+    assert [card.code for card in shoe.deal_cards(10)] == list(reversed(corpus.order(0)))[20:30]
+
+
+def test_start_and_step_hand_out_separate_shoes(corpus_path):
+    tables = [Shoe(deck_count=1, corpus_path=corpus_path, corpus_start=i, corpus_step=2) for i in range(2)]
+    used = [[], []]
+    for _ in range(3):
+        for table, orders in zip(tables, used):
+            orders.append(bytes(table.cards.view))
+            table.build_shoe()
+    corpus = ShoeCorpus(corpus_path)
+    assert used[0] == [bytes(corpus.order(i)) for i in (0, 2, 4)]
+    assert used[1] == [bytes(corpus.order(i)) for i in (1, 3, 5)]
+    assert not set(used[0]) & set(used[1])
+
+
+def test_csm_cant_deal_from_a_corpus(corpus_path):
+    with pytest.raises(ValueError):
+        Shoe(deck_count=1, use_csm=True, corpus_path=corpus_path)
@@ -0,0 +1,24 @@
+import pytest
+
+from distributed import Coordinator, make_units, merge_results, run_local
+
+ROSTER = [["CardCountingPlayer", "Pro", "IndexStrategy", 100000]]
+SHOE = {"deck_count": 6, "penetration": 0.75, "use_csm": False}
+
+
+def test_run_local_covers_every_unit():
+    results = run_local(make_units(ROSTER, SHOE, 4, 200), n_workers=2)
+    assert [result["id"] for result in results] == [0, 1, 2, 3]
+    assert merge_results(results)["players"]["Pro"]["units"] == 4
+
+
+def test_unit_that_keeps_failing_fails_the_run():
+    units = make_units([["Player", "Nobody", "NoSuchStrategy", 100]], SHOE, 2, 10)
+    with pytest.raises(RuntimeError, match="failed 2 times"):
+        run_local(units, n_workers=1, max_attempts=2)
+
+
+def test_no_workers_fails_the_run():
+    coordinator = Coordinator(make_units(ROSTER, SHOE, 1, 10), worker_wait=0.5)
+    with pytest.raises(RuntimeError, match="No workers"):
+        coordinator.run()
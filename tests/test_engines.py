@@ -0,0 +1,76 @@
+"""Every fast engine has to come out exactly like Round: same cards, same bankrolls."""
+
+import contextlib
+import io
+import pickle
+
+import pytest
+
+from golden import DEFAULT_ROSTER
+from hand import Hand
+from round import Round
+from rules import DEFAULT_SHOE
+from session import seeded_table
+from sim_round import SimRound
+from stats import TrueCountStats
+
+N_ROUNDS = 1500
+
+
+def play(engine, seed: int, roster: list[list] = DEFAULT_ROSTER, n_rounds: int = N_ROUNDS) -> tuple[list[int], dict]:
+    """Final bankroll of every seat (broke ones included) and the true count stats."""
+    players, shoe = seeded_table(roster, DEFAULT_SHOE, seed)
+    seats = list(players)
+    tc_stats = TrueCountStats()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for round_number in range(1, n_rounds + 1):
+            if not players: break
+            engine(players, shoe, round_number, False, tc_stats).play_round()
+    return [player.bankroll for player in seats], tc_stats.to_dict()
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_sim_round_matches_round(seed):
+    assert play(SimRound, seed) == play(Round, seed)
+
+
+def test_sim_round_matches_round_through_removals():
+    # Small bankrolls, so seats go broke and get removed along the way.
+    roster = [row[:3] + [2000] for row in DEFAULT_ROSTER]
+    bankrolls, _ = play(Round, 7, roster)
+    assert any(bankroll <= 0 for bankroll in bankrolls)
+    assert play(SimRound, 7, roster) == play(Round, 7, roster)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_table_round_matches_round(seed):
+    table_state = pytest.importorskip("table_state")
+    pytest.importorskip("numpy")
+    roster = [["CardCountingPlayer", f"Basic {i}", "BasicStrategy", 100000] for i in range(7)] + DEFAULT_ROSTER
+    assert play(table_state.TableRound, seed, roster) == play(Round, seed, roster)
+
+
+def test_table_round_matches_round_through_removals():
+    table_state = pytest.importorskip("table_state")
+    pytest.importorskip("numpy")
+    roster = [row[:3] + [2000] for row in DEFAULT_ROSTER]
+    assert play(table_state.TableRound, 7, roster) == play(Round, 7, roster)
+
+
+def test_table_state_lives_on_the_shoe():
+    table_state = pytest.importorskip("table_state")
+    pytest.importorskip("numpy")
+    players, shoe = seeded_table(DEFAULT_ROSTER, DEFAULT_SHOE, 0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        round_ = table_state.TableRound(players, shoe, 1, False)
+        round_.play_round()
+    state = shoe.table_state
+    assert isinstance(state, table_state.TableState)
+    # Settled hands let go of the arrays, and total their cards again.
+    hands = [round_.dealer_hand] + [hand for player in players for hand in player.final_hands]
+    assert all(hand.state is None and hand.hand_total() == Hand.hand_total(hand) for hand in hands)
+    assert not state.hands
+    # The next round reuses the same state, and it survives a pickle (as a fresh one of the same size).
+    table_state.TableRound(players, shoe, 2, False).play_round()
+    assert shoe.table_state is state
+    assert isinstance(pickle.loads(pickle.dumps(shoe)).table_state, table_state.TableState)
@@ -0,0 +1,34 @@
+import pytest
+
+import golden
+from sim_round import SimRound
+
+
+class ExtraCardRound(SimRound):
+    """Deals one card to nobody before every round."""
+
+    def play_round(self):
+        self.shoe.deal_card()
+        super().play_round()
+
+
+def test_sim_round_replays_the_golden_trace(tmp_path):
+    path = str(tmp_path / "golden.jsonl.gz")
+    assert golden.record(path, 800, seed=3) == 800
+    assert golden.replay(path, SimRound) is None
+
+
+def test_replay_finds_the_first_divergence(tmp_path):
+    path = str(tmp_path / "golden.jsonl")
+    golden.record(path, 50, seed=3)
+    divergence = golden.replay(path, ExtraCardRound)
+    assert divergence["round"] == 1
+    assert divergence["field"] == "cards"
+
+
+def test_table_round_replays_the_golden_trace(tmp_path):
+    table_state = pytest.importorskip("table_state")
+    pytest.importorskip("numpy")
+    path = str(tmp_path / "golden.jsonl.gz")
+    golden.record(path, 800, seed=3)
+    assert golden.replay(path, table_state.TableRound) is None
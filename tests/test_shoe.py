@@ -0,0 +1,18 @@
+import pytest
+
+from shoe import Shoe
+
+
+@pytest.mark.parametrize("use_csm", [False, True])
+def test_deal_cards_deals_like_deal_card(use_csm):
+    one_by_one = Shoe(deck_count=2, use_csm=use_csm, seed=5)
+    in_bulk = Shoe(deck_count=2, use_csm=use_csm, seed=5)
+    for n in (3, 11, 40, 1, 70): # Enough to go through the cut card a few times.
+        for _ in range(20):
+            expected = [one_by_one.deal_card() for _ in range(n)]
+            assert in_bulk.deal_cards(n) == expected
+            assert in_bulk.discards == one_by_one.discards
+            assert in_bulk.card_counter.running_count == one_by_one.card_counter.running_count
+            assert in_bulk.card_counter.true_count == one_by_one.card_counter.true_count
+            one_by_one.csm_recycle() # Once a round, like the engines do.
+            in_bulk.csm_recycle()
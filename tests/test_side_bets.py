@@ -0,0 +1,66 @@
+import contextlib
+import io
+import itertools
+import random
+
+import pytest
+
+from player import Players
+from round import Round
+from rules import DEFAULT_SHOE
+from session import seeded_table
+from side_bets import PerfectPairs, TwentyOnePlusThree, PERFECT_PAIRS_TABLE, TWENTY_ONE_PLUS_THREE_TABLE
+from sim_round import SimRound
+from stats import TrueCountStats
+
+
+def brute_force_ev(table, n_cards: int, composition: list[int]) -> float:
+    """Average return over every ordered draw of n_cards, minus the bet."""
+    cards = [code for code, count in enumerate(composition) for _ in range(count)]
+    draws = list(itertools.permutations(range(len(cards)), n_cards))
+    returned = 0
+    for draw in draws:
+        index = 0
+        for i in draw:
+            index = index * 52 + cards[i]
+        payout = table[index]
+        returned += payout + 1 if payout else 0
+    return returned / len(draws) - 1
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_ev_matches_brute_force(seed):
+    rng = random.Random(seed)
+    composition = [0] * 52
+    for code in rng.sample(range(52), 14):
+        composition[code] = rng.randint(1, 2)
+    assert PerfectPairs(1).ev(composition) == pytest.approx(brute_force_ev(PERFECT_PAIRS_TABLE, 2, composition))
+    assert TwentyOnePlusThree(1).ev(composition) == pytest.approx(brute_force_ev(TWENTY_ONE_PLUS_THREE_TABLE, 3, composition))
+
+
+@pytest.mark.parametrize("engine", [Round, SimRound])
+def test_side_bets_stay_out_of_true_count_stats(engine):
+    # BasicStrategy bets by the count alone (with this bankroll), so side bets can't change the main game.
+    roster = [["CardCountingPlayer", "Basic", "BasicStrategy", 10 ** 7]]
+    results = []
+    for with_side_bets in (False, True):
+        players, shoe = seeded_table(roster, DEFAULT_SHOE, 0)
+        if with_side_bets:
+            players[0].side_bets = [PerfectPairs(25), TwentyOnePlusThree(25)]
+        tc_stats = TrueCountStats()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for round_number in range(1, 1001):
+                engine(players, shoe, round_number, False, tc_stats).play_round()
+        results.append(tc_stats.to_dict())
+    assert results[0] == results[1]
+
+
+def test_side_bets_survive_a_roster_spec():
+    players, _ = seeded_table([["Player", "Side", "BasicStrategy", 1000], ["Player", "Plain", "BasicStrategy", 1000]], DEFAULT_SHOE, 0)
+    players[0].side_bets = [PerfectPairs(5), TwentyOnePlusThree(10, min_ev=-0.02)]
+    spec = Players.to_spec(players)
+    assert spec[0][4] == [["PerfectPairs", 5, None], ["TwentyOnePlusThree", 10, -0.02]]
+    assert len(spec[1]) == 4
+    rebuilt = Players.from_spec(spec)
+    assert Players.to_spec(rebuilt) == spec
+    assert isinstance(rebuilt[0].side_bets[1], TwentyOnePlusThree)
@@ -0,0 +1,75 @@
+import pytest
+
+from actions import Action, ChartCode
+from counter import CardCounter
+from deck import Card
+from hand import Hand
+from player import (BasicStrategy, CardCountingPlayer, IndexStrategy, INDEX_MAX_TC, INDEX_MIN_TC, Player,
+                    compile_index_table)
+
+
+class StandStrategy(BasicStrategy):
+    def lookup(self, player, chart, row, dk):
+        return ChartCode.STAND
+
+
+def seat(strategy, *ranks) -> Player:
+    player = Player("p", strategy, 1000)
+    player.current_hand = Hand()
+    player.current_hand.bet = 10
+    player.current_hand.cards = [Card(rank, "♥") for rank in ranks]
+    player.hands_collection.append(player.current_hand)
+    return player
+
+
+def test_two_card_table_is_per_class():
+    upcard = Card("7", "♠")
+    assert BasicStrategy().make_decisions([seat(BasicStrategy(), "5", "6")], upcard) == [Action.DOUBLE]
+    assert StandStrategy().make_decisions([seat(StandStrategy(), "5", "6")], upcard) == [Action.STAND]
+    assert StandStrategy.two_card_table is not BasicStrategy.two_card_table
+
+
+def test_overriding_lookup_turns_batching_off():
+    assert BasicStrategy.batchable
+    assert not StandStrategy.batchable
+    assert not IndexStrategy.batchable
+
+
+def counting_seat(true_count, *ranks) -> CardCountingPlayer:
+    player = CardCountingPlayer("p", IndexStrategy(), 1000)
+    player.card_counter = CardCounter()
+    player.card_counter.true_count = true_count
+    player.current_hand = Hand()
+    player.current_hand.bet = 10
+    player.current_hand.cards = [Card(rank, "♥") for rank in ranks]
+    player.hands_collection.append(player.current_hand)
+    return player
+
+
+def decide(true_count, upcard, *ranks) -> Action:
+    player = counting_seat(true_count, *ranks)
+    return player.make_decision(Card(upcard, "♠"))
+
+
+def test_sixteen_against_ten_stands_from_zero():
+    assert decide(-1, "K", "10", "6") == Action.HIT
+    assert decide(0, "K", "10", "6") == Action.STAND
+
+
+def test_at_most_row_flips_at_its_index():
+    # 12 v 4 stands by the chart, and hits at -1 or below.
+    assert decide(0, "4", "10", "2") == Action.STAND
+    assert decide(-1, "4", "10", "2") == Action.HIT
+    assert decide(-5, "4", "10", "2") == Action.HIT
+
+
+def test_counts_outside_the_table_are_clamped():
+    assert decide(INDEX_MAX_TC + 15, "9", "10", "6") == decide(INDEX_MAX_TC, "9", "10", "6") == Action.STAND
+    assert decide(INDEX_MIN_TC - 15, "4", "10", "2") == decide(INDEX_MIN_TC, "4", "10", "2") == Action.HIT
+
+
+def test_deviation_outside_the_charts_is_rejected(tmp_path):
+    path = tmp_path / "deviations.csv"
+    path.write_text("Chart,Player Total,Dealer,Index,When,Play\nhard,16,10,0,>=,S\nhard,23,10,0,>=,S\n")
+    with pytest.raises(ValueError):
+        compile_index_table(str(path))
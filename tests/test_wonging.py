@@ -0,0 +1,67 @@
+import wonging
+from player import BasicStrategy, CardCountingPlayer
+from shoe import Shoe
+from sim_round import SimRound
+from wonging import DEALER_CARDS_PER_ROUND, WongSession
+
+N_ROUNDS = 400
+N_TABLES = 4
+SEED = 21
+
+
+class WatchedRound(SimRound):
+    """SimRound that notes which table it was played at and where that table's count ended up."""
+    played = []
+
+    def play_round(self):
+        player = self.players[0]
+        assert player.card_counter is self.shoe.card_counter
+        super().play_round()
+        self.played.append((self.round_number, self.shoe, self.shoe.card_counter.true_count))
+
+
+class WatchedSession(WongSession):
+    def choose_table(self):
+        table = super().choose_table()
+        if table is not None:
+            assert self.shoes[table].card_counter.true_count >= self.entry_tc
+        return table
+
+
+def wong(monkeypatch, entry_tc: int = 2) -> tuple[WongSession, list]:
+    WatchedRound.played = []
+    monkeypatch.setattr(wonging, "SimRound", WatchedRound)
+    player = CardCountingPlayer("Wong", BasicStrategy(), 10 ** 6)
+    session = WatchedSession(player, N_ROUNDS, N_TABLES, entry_tc=entry_tc, exit_tc=0, seed=SEED, deck_count=2)
+    session.play_session(print_results=False)
+    return session, WatchedRound.played
+
+
+def test_sits_at_entry_tc_and_leaves_below_exit_tc(monkeypatch):
+    session, played = wong(monkeypatch)
+    assert 0 < session.rounds_played < N_ROUNDS
+    for (round_number, shoe, true_count), (next_round, next_shoe, _) in zip(played, played[1:]):
+        stayed = next_round == round_number + 1 and next_shoe is shoe
+        assert stayed == (true_count >= session.exit_tc)
+
+
+def test_watched_tables_reshuffle_like_dealt_ones(monkeypatch):
+    session, played = wong(monkeypatch, entry_tc=99) # Never sits, so every table is only watched.
+    assert not played
+    for i in range(N_TABLES):
+        reference = Shoe(deck_count=2, seed=SEED + i)
+        for _ in range(N_ROUNDS):
+            for _ in range(session.other_cards_per_round + DEALER_CARDS_PER_ROUND):
+                reference.deal_card()
+        shoe = session.shoes[i]
+        assert shoe.reshuffles == reference.reshuffles > 0
+        assert len(shoe.cards) == len(reference.cards)
+        assert shoe.card_counter.running_count == reference.card_counter.running_count
+
+
+def test_same_seed_same_run(monkeypatch):
+    first, first_played = wong(monkeypatch)
+    second, second_played = wong(monkeypatch)
+    assert (first.player.bankroll, first.rounds_played, first.table_moves) == \
+           (second.player.bankroll, second.rounds_played, second.table_moves)
+    assert [(r, tc) for r, _, tc in first_played] == [(r, tc) for r, _, tc in second_played]
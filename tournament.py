@@ -0,0 +1,146 @@
+"""Strategy tournament: every registered strategy against exactly the same shoes, one seat each.
+
+Each match is a single strategy, alone at its own table (so nobody else's play changes its cards),
+playing a seeded session. Match k uses seed `seed + k` for every strategy, so each strategy sees the
+same shuffles (or, with a corpus, the same corpus shoes, which no other match uses). Matches are spread
+over a process pool, then summed into a leaderboard with 95% confidence intervals.
+
+    python tournament.py --matches 200 --rounds 10000 --processes 8
+
+EV and variance are per round, as a % of the bankroll going into the round, since most strategies
+bet a fraction of their bankroll (a raw $ EV would mostly measure bet size).
+"""
+
+import argparse
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+from player import Players
+from rules import DEFAULT_SHOE
+from session import Session
+
+
+Z_95 = 1.96
+SKIP_STRATEGIES = {"HumanStrategy"}
+
+
+def tournament_strategies() -> list[str]:
+    return [name for name in Players.STRATEGIES if name not in SKIP_STRATEGIES]
+
+
+def play_match(match: dict) -> dict:
+    """Play one strategy through one seeded session. Stops early (and counts as ruined) at $0."""
+    # Everyone sits as a CardCountingPlayer; the counter is harmless for strategies that ignore it.
+    roster = [["CardCountingPlayer", match["strategy"], match["strategy"], match["bankroll"]]]
+    shoe = match["shoe"]
+    if "corpus_path" in shoe:
+        # Match k deals corpus shoes k, k + n, k + 2n, ... (n matches), so no two matches share a shoe
+        # until the corpus wraps around. Every strategy's match k gets the same ones.
+        shoe = {**shoe, "corpus_start": match["match"], "corpus_step": match["n_matches"]}
+    session = Session.from_config(roster, shoe, match["seed"], match["n_rounds"])
+    player = session.players[0]
+
+    rounds = 0
+    sum_r = sum_r2 = 0.0
+    bankroll = player.initial_bankroll
+    for result in session.iter_rounds():
+        r = result.nets[0] / bankroll
+        rounds += 1
+        sum_r += r
+        sum_r2 += r * r
+        bankroll = result.bankrolls[0]
+        if bankroll <= 0: break # Ruined; removal_check would drop the seat next round anyway.
+
+    return {"strategy": match["strategy"], "seed": match["seed"], "rounds": rounds,
+            "sum_r": sum_r, "sum_r2": sum_r2, "bankroll": bankroll,
+            "initial_bankroll": player.initial_bankroll, "max_bankroll": session.max_bankrolls[player]}
+
+
+def make_matches(strategies: list[str], n_matches: int, n_rounds: int, bankroll: int = 100000,
+                 shoe: dict = None, seed: int = 0) -> list[dict]:
+    shoe = DEFAULT_SHOE if shoe is None else shoe
+    return [{"strategy": strategy, "match": k, "n_matches": n_matches, "seed": seed + k,
+             "n_rounds": n_rounds, "bankroll": bankroll, "shoe": shoe}
+            for k in range(n_matches) for strategy in strategies]
+
+
+def mean_ci(values: list[float]) -> tuple[float, float]:
+    """Mean and the half-width of its 95% confidence interval."""
+    n = len(values)
+    mean = sum(values) / n
+    if n < 2: return mean, math.inf
+    var = sum((v - mean) ** 2 for v in values) / (n - 1)
+    return mean, Z_95 * math.sqrt(var / n)
+
+
+def wilson_ci(successes: int, n: int) -> tuple[float, float]:
+    """Wilson score interval for a proportion (behaves at 0% and 100%, unlike the normal one)."""
+    p = successes / n
+    denominator = 1 + Z_95 ** 2 / n
+    center = (p + Z_95 ** 2 / (2 * n)) / denominator
+    half = Z_95 * math.sqrt(p * (1 - p) / n + Z_95 ** 2 / (4 * n * n)) / denominator
+    return center - half, center + half
+
+
+def leaderboard(results: list[dict]) -> list[dict]:
+    """One row per strategy, best EV first."""
+    by_strategy = {}
+    for result in results:
+        by_strategy.setdefault(result["strategy"], []).append(result)
+
+    rows = []
+    for strategy, matches in by_strategy.items():
+        rounds = sum(m["rounds"] for m in matches)
+        ev = sum(m["sum_r"] for m in matches) / rounds
+        variance = sum(m["sum_r2"] for m in matches) / rounds - ev * ev
+        max_growth, max_growth_ci = mean_ci([(m["max_bankroll"] - m["initial_bankroll"]) / m["initial_bankroll"] for m in matches])
+        survived, survived_ci = mean_ci([m["rounds"] for m in matches])
+        ruined = sum(m["bankroll"] <= 0 for m in matches)
+        rows.append({"strategy": strategy, "matches": len(matches), "rounds": rounds,
+                     "ev": ev, "ev_ci": Z_95 * math.sqrt(variance / rounds), "variance": variance,
+                     "max_growth": max_growth, "max_growth_ci": max_growth_ci,
+                     "ruin_rate": ruined / len(matches), "ruin_ci": wilson_ci(ruined, len(matches)),
+                     "rounds_survived": survived, "rounds_survived_ci": survived_ci})
+    rows.sort(key=lambda row: row["ev"], reverse=True)
+    return rows
+
+
+def run_tournament(n_matches: int, n_rounds: int, strategies: list[str] = None, bankroll: int = 100000,
+                   shoe: dict = None, seed: int = 0, processes: int = None) -> list[dict]:
+    strategies = tournament_strategies() if strategies is None else strategies
+    matches = make_matches(strategies, n_matches, n_rounds, bankroll, shoe, seed)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = list(pool.map(play_match, matches, chunksize=max(1, len(matches) // (8 * (processes or 4)))))
+    return leaderboard(results)
+
+
+def print_leaderboard(rows: list[dict]) -> None:
+    print("\n", "=" * 30, sep="")
+    print("\nTOURNAMENT LEADERBOARD (95% CIs):")
+    print("\n", "=" * 30, sep="")
+    print("\n   Strategy                  | EV/round %        | SD/round % | Max growth %        | Ruin rate %          | Rounds survived")
+    print("   --------------------------+-------------------+------------+---------------------+----------------------+------------------------")
+    for place, row in enumerate(rows, 1):
+        low, high = row["ruin_ci"]
+        ruin_ci = f"({100 * low:.1f}-{100 * high:.1f})"
+        print(f"{place:>2} {row['strategy']:<26} | {100 * row['ev']:>+7.3f} ± {100 * row['ev_ci']:<6.3f} "
+              f"| {100 * math.sqrt(row['variance']):>10.3f} "
+              f"| {100 * row['max_growth']:>8.2f} ± {100 * row['max_growth_ci']:<8.2f} "
+              f"| {100 * row['ruin_rate']:>6.2f} {ruin_ci:<13} "
+              f"| {row['rounds_survived']:>10.1f} ± {row['rounds_survived_ci']:.1f}")
+    print(f"\n{rows[0]['matches'] if rows else 0} matches per strategy, same shoes for everyone.\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every strategy against the same shoes.")
+    parser.add_argument("--matches", type=int, default=100, help="Seeded sessions per strategy.")
+    parser.add_argument("--rounds", type=int, default=10000, help="Max rounds per session.")
+    parser.add_argument("--bankroll", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0, help="Match k uses seed + k.")
+    parser.add_argument("--processes", type=int, default=None, help="Defaults to one per CPU.")
+    parser.add_argument("--corpus", default=None, help="Deal from a corpus file (see corpus.py) instead of shuffling.")
+    parser.add_argument("--strategies", nargs="+", default=None, choices=tournament_strategies())
+    args = parser.parse_args()
+
+    shoe = {**DEFAULT_SHOE, "corpus_path": args.corpus} if args.corpus else DEFAULT_SHOE
+    print_leaderboard(run_tournament(args.matches, args.rounds, args.strategies, args.bankroll, shoe, args.seed, args.processes))
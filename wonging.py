@@ -0,0 +1,95 @@
+from player import CardCountingPlayer
+from shoe import Shoe
+from sim_round import SimRound
+from stats import TrueCountStats
+
+
+DEALER_CARDS_PER_ROUND = 3 # Roughly what a dealer uses per round, for tables we only watch.
+
+
+class WongSession:
+    """Back-counting ("wonging") across many tables at once.
+
+    Every table has its own Shoe (and therefore its own CardCounter), and every table plays a round
+    each tick. The counter watches them all, sits at the table with the best true count once it
+    reaches entry_tc, and leaves when that table's count drops below exit_tc. Tables without the
+    counter only burn cards through Shoe.burn (count only, no hands), which is why watching 20 tables
+    costs little more than playing at one. Pass corpus_path (see corpus.py) to also make their
+    reshuffles free; each table then deals every n_tables-th shoe of the corpus."""
+
+    def __init__(self, player: CardCountingPlayer, n_rounds: int, n_tables: int = 20,
+                 entry_tc: int = 2, exit_tc: int = 0, other_cards_per_round: int = 9,
+                 seed: int = None, tc_stats: TrueCountStats = None, **shoe_kwargs):
+        if exit_tc > entry_tc:
+            raise ValueError("exit_tc must not be above entry_tc, or the counter would leave as soon as they sit.")
+        self.player = player
+        self.n_rounds = n_rounds
+        self.entry_tc = entry_tc
+        self.exit_tc = exit_tc
+        self.other_cards_per_round = other_cards_per_round # Cards used by the other (simulated) seats at each table.
+        self.tc_stats = tc_stats
+        if "corpus_path" in shoe_kwargs:
+            shoe_kwargs = {**shoe_kwargs, "corpus_step": n_tables} # Table i gets shoes i, i + n_tables, ...
+            self.shoes = [Shoe(corpus_start=i, **shoe_kwargs) for i in range(n_tables)]
+        else:
+            self.shoes = [Shoe(seed=None if seed is None else seed + i, **shoe_kwargs) for i in range(n_tables)]
+        self.seat = [player]   # Roster passed to SimRound. Reused every round, emptied if the player goes broke.
+        self.table = None      # Index of the table the counter is sitting at (None when only watching).
+        self.rounds_played = 0
+        self.table_moves = 0
+        self.rounds_watched = 0
+        self.max_bankroll = player.bankroll
+
+
+    def choose_table(self) -> int | None:
+        """Best table whose true count is at or above entry_tc, if any."""
+        best, best_tc = None, self.entry_tc - 1
+        for i, shoe in enumerate(self.shoes):
+            if shoe.card_counter.true_count > best_tc:
+                best, best_tc = i, shoe.card_counter.true_count
+        return best
+
+
+    def play_session(self, print_results: bool = True) -> None:
+        burn_watched = self.other_cards_per_round + DEALER_CARDS_PER_ROUND
+        for round_number in range(1, self.n_rounds + 1):
+            self.rounds_watched = round_number
+            if self.table is None:
+                self.table = self.choose_table()
+                if self.table is not None:
+                    self.table_moves += 1
+                    self.player.card_counter = self.shoes[self.table].card_counter
+
+            for i, shoe in enumerate(self.shoes):
+                if i != self.table:
+                    shoe.burn(burn_watched)
+                    continue
+                shoe.burn(self.other_cards_per_round) # Seats to the counter's right act first.
+                SimRound(self.seat, shoe, round_number, False, self.tc_stats).play_round()
+                self.rounds_played += 1
+
+            if self.table is not None:
+                self.max_bankroll = max(self.max_bankroll, self.player.bankroll)
+                if self.player.bankroll <= 0:
+                    break
+                if self.shoes[self.table].card_counter.true_count < self.exit_tc:
+                    self.table = None
+
+        if print_results: self.print_results()
+
+
+    def print_results(self) -> None:
+        player = self.player
+        growth = 100 * (player.bankroll - player.initial_bankroll) / player.initial_bankroll
+        print("\n", "=" * 30, sep="")
+        print("\nWONGING RESULTS:")
+        print("\n", "=" * 30, sep="")
+        print(f"\nWatched {len(self.shoes)} tables for {self.rounds_watched} rounds "
+              f"(enter at TC {self.entry_tc}+, leave below TC {self.exit_tc})")
+        print(f"{player.name} played {self.rounds_played} rounds ({100 * self.rounds_played / self.rounds_watched:.2f}%) "
+              f"and sat down {self.table_moves} times")
+        print(f"{player.name} finished with ${player.bankroll} (net growth: {growth:.2f}%)")
+        print(f"{player.name}'s max bankroll: ${self.max_bankroll}")
+        print("")
+        if self.tc_stats is not None:
+            self.tc_stats.print_summary()